@@ -21,18 +21,21 @@ logging.basicConfig(
 # Constantes
 HOST = '127.0.0.1'
 PORT = 5000
+PLAZO_ESPERA = 30  # Segundos que el avión espera pista antes de abandonar la solicitud
+MARGEN_OPERACION = 5  # Margen sobre el tiempo de operación para esperar la confirmación de la torre
 
 
 class Avion:
     """Cliente que simula un avión solicitando operaciones a la torre de control"""
     
-    def __init__(self, id_vuelo=None, tipo_operacion=None):
+    def __init__(self, id_vuelo=None, tipo_operacion=None, plazo_espera=PLAZO_ESPERA):
         """
         Inicializa un nuevo avión
         
         Args:
             id_vuelo: Identificador único del vuelo (si es None, se genera uno aleatorio)
             tipo_operacion: Tipo de operación a realizar ('aterrizaje' o 'despegue')
+            plazo_espera: Segundos que el avión espera pista antes de abandonar
         """
         # Si no se especifica el ID, generamos uno aleatorio
         self.id_vuelo = id_vuelo or self._generar_id_vuelo()
@@ -40,6 +43,8 @@ class Avion:
         # Si no se especifica el tipo de operación, elegimos uno aleatorio
         self.tipo_operacion = tipo_operacion or choice(['aterrizaje', 'despegue'])
         
+        self.plazo_espera = plazo_espera
+        
         # Variables para medir tiempos
         self.tiempo_inicio = None
         self.tiempo_autorizacion = None
@@ -48,6 +53,9 @@ class Avion:
         # Identificador extra para aerolíneas (para mejor visualización)
         self.aerolinea = choice(['IB', 'AA', 'DL', 'UA', 'BA', 'LH', 'AF'])
         
+        # Clase del avión (por estela turbulenta), usada por la torre para la separación
+        self.clase = choice(['ligero', 'medio', 'medio', 'medio', 'pesado'])
+        
         # Configurar logging con el ID del vuelo
         self.logger = logging.getLogger(f"Avion-{self.id_vuelo}")
         self.logger.handlers = []
@@ -58,7 +66,7 @@ class Avion:
         ))
         self.logger.addHandler(handler)
         
-        self.log_info(f"Iniciando vuelo - Operación: {self.tipo_operacion}")
+        self.log_info(f"Iniciando vuelo - Operación: {self.tipo_operacion} ({self.clase})")
     
     def _generar_id_vuelo(self):
         """Genera un ID de vuelo aleatorio"""
@@ -87,6 +95,8 @@ class Avion:
                 'id': self.id_vuelo,
                 'tipo': self.tipo_operacion,
                 'aerolinea': self.aerolinea,
+                'clase': self.clase,
+                'plazo': self.plazo_espera,
                 'timestamp': time.time()
             }
             
@@ -94,10 +104,22 @@ class Avion:
             writer.write(json.dumps(solicitud).encode())
             await writer.drain()
             
-            # Esperar respuesta de la torre
-            data = await reader.read(1024)
-            if data:
-                respuesta = json.loads(data.decode())
+            # La conexión sigue abierta durante toda la operación: si el avión la cierra,
+            # la torre cancela su solicitud y libera la pista
+            try:
+                respuesta = await self._leer_respuesta(reader)
+                if respuesta and respuesta.get('status') == 'en_espera':
+                    self.log_info(f"Solicitud en espera: {respuesta.get('mensaje', 'Sin información')}")
+                    self.log_info(f"Esperando autorización (máximo {self.plazo_espera}s)...")
+                    respuesta = await asyncio.wait_for(self._leer_respuesta(reader), self.plazo_espera)
+            except asyncio.TimeoutError:
+                self.log_error("Plazo de espera agotado, se abandona la solicitud")
+                respuesta = None
+            else:
+                if respuesta is None:
+                    self.log_error("No se recibió respuesta de la torre")
+
+            if respuesta:
                 self.tiempo_autorizacion = time.perf_counter()
                 tiempo_espera = self.tiempo_autorizacion - self.tiempo_inicio
                 
@@ -108,33 +130,31 @@ class Avion:
                     self.log_info(f"Autorización recibida para {self.tipo_operacion} "
                                  f"en pista {pista} (espera: {tiempo_espera:.2f}s)")
                     
-                    # Simular tiempo de operación
-                    tiempo_operacion = 5 if self.tipo_operacion == 'aterrizaje' else 3
+                    # La torre indica cuánto ocupará la pista (separación + operación)
+                    tiempo_operacion = respuesta.get('tiempo_operacion',
+                                                     5 if self.tipo_operacion == 'aterrizaje' else 3)
                     self.log_info(f"Iniciando {self.tipo_operacion} en pista {pista}...")
-                    await asyncio.sleep(tiempo_operacion)
-                    
-                    # Completar operación
-                    self.tiempo_completado = time.perf_counter()
-                    tiempo_total = self.tiempo_completado - self.tiempo_inicio
                     
-                    self.log_info(f"{self.tipo_operacion.capitalize()} completado "
-                                 f"(tiempo total: {tiempo_total:.2f}s)")
-                elif status == 'en_espera':
-                    self.log_info(f"Solicitud en espera: {respuesta.get('mensaje', 'Sin información')}")
-                    # Podríamos implementar un bucle de reintento aquí si fuera necesario
-                    # Por ahora, simplemente esperamos a que la torre nos procese
-                    await asyncio.sleep(2)
-                    self.log_info(f"Esperando autorización...")
+                    try:
+                        confirmacion = await asyncio.wait_for(
+                            self._leer_respuesta(reader), tiempo_operacion + MARGEN_OPERACION
+                        )
+                    except asyncio.TimeoutError:
+                        confirmacion = None
                     
-                    # Para este escenario simplificado, asumimos que la torre nos procesará
-                    # eventualmente sin necesidad de reenviar la solicitud
-                    self.tiempo_completado = time.perf_counter()
-                    tiempo_total = self.tiempo_completado - self.tiempo_inicio
-                    self.log_info(f"{self.tipo_operacion.capitalize()} completado después de espera")
+                    if confirmacion and confirmacion.get('status') == 'completado':
+                        # Completar operación
+                        self.tiempo_completado = time.perf_counter()
+                        tiempo_total = self.tiempo_completado - self.tiempo_inicio
+                        
+                        self.log_info(f"{self.tipo_operacion.capitalize()} completado "
+                                     f"(tiempo total: {tiempo_total:.2f}s)")
+                    else:
+                        self.log_error("La torre no confirmó el fin de la operación")
+                elif status == 'cancelado':
+                    self.log_error(f"Solicitud cancelada: {respuesta.get('mensaje', 'Sin información')}")
                 else:
                     self.log_error(f"Solicitud rechazada: {respuesta.get('mensaje', 'Sin información')}")
-            else:
-                self.log_error("No se recibió respuesta de la torre")
             
             # Cerrar conexión
             writer.close()
@@ -146,6 +166,14 @@ class Avion:
             self.log_error(f"Error durante la operación: {e}")
 
 
+    async def _leer_respuesta(self, reader):
+        """Lee un mensaje de la torre (JSON por línea); None si la torre cierra la conexión"""
+        linea = await reader.readline()
+        if not linea:
+            return None
+        return json.loads(linea.decode())
+
+
 async def main():
     """Función principal para iniciar el avión desde línea de comandos"""
     # Procesar argumentos de línea de comandos
@@ -161,8 +189,19 @@ async def main():
             print("Tipo de operación no válido. Debe ser 'aterrizaje' o 'despegue'")
             sys.exit(1)
     
+    plazo_espera = PLAZO_ESPERA
+    if len(sys.argv) > 3:
+        try:
+            plazo_espera = float(sys.argv[3])
+        except ValueError:
+            plazo_espera = None
+        # Igual que la torre, que ignora plazos no positivos; NaN e infinito tampoco valen
+        if plazo_espera is None or not 0 < plazo_espera < float("inf"):
+            print("Plazo de espera no válido. Debe ser un número de segundos mayor que cero")
+            sys.exit(1)
+    
     # Crear y ejecutar el avión
-    avion = Avion(id_vuelo, tipo_operacion)
+    avion = Avion(id_vuelo, tipo_operacion, plazo_espera)
     await avion.iniciar_operacion()
 
 
@@ -0,0 +1,229 @@
+"""
+capacidad.py - Modelo analítico de capacidad de pistas (colas M/M/c y M/G/c)
+
+Trata el aeropuerto como una cola con c servidores (pistas) y llegadas de Poisson.
+El tiempo de servicio de una pista es el tiempo que queda ocupada por operación
+(separación + operación). Para M/G/c se usa la aproximación de Allen-Cunneen.
+"""
+
+import argparse
+import asyncio
+import math
+import sys
+from itertools import product
+
+from control import enviar_comando
+from planificador import CLASES, OPERACIONES, TIEMPOS_SERVICIO, media, separacion, varianza
+from torre import CONTROL_PORT, MAX_PISTAS
+
+PERCENTILES = (50, 95, 99)
+MAX_PISTAS_BUSQUEDA = 100
+
+# Mezcla de tráfico que genera avion.py: operaciones al 50% y clases ligero/medio/pesado en 1:3:1
+PESO_CLASES = {"ligero": 1, "medio": 3, "pesado": 1}
+MEZCLA_TRAFICO = {(op, clase): PESO_CLASES[clase] for op, clase in product(OPERACIONES, CLASES)}
+
+
+def erlang_c(pistas, carga):
+    """
+    Probabilidad de que una llegada tenga que esperar (fórmula de Erlang C)
+
+    Args:
+        pistas: Número de servidores c
+        carga: Carga ofrecida a = λ/μ (en erlangs)
+    """
+    if carga >= pistas:
+        return 1.0
+    # Recurrencia de Erlang B, numéricamente estable para c grandes
+    erlang_b = 1.0
+    for k in range(1, pistas + 1):
+        erlang_b = carga * erlang_b / (k + carga * erlang_b)
+    return pistas * erlang_b / (pistas - carga * (1 - erlang_b))
+
+
+def modelo_cola(llegadas_hora, servicio_medio, servicio_cv2=1.0, pistas=MAX_PISTAS):
+    """
+    Métricas esperadas de una cola M/G/c (M/M/c si servicio_cv2 == 1)
+
+    Args:
+        llegadas_hora: Tasa de llegadas λ en operaciones por hora
+        servicio_medio: Tiempo medio de ocupación de pista por operación (segundos)
+        servicio_cv2: Coeficiente de variación al cuadrado del tiempo de servicio
+        pistas: Número de pistas c
+    """
+    llegadas = llegadas_hora / 3600
+    carga = llegadas * servicio_medio
+    utilizacion = carga / pistas
+
+    resultado = {
+        "pistas": pistas,
+        "llegadas_ops_hora": llegadas_hora,
+        "servicio_medio": servicio_medio,
+        "servicio_cv2": servicio_cv2,
+        "capacidad_ops_hora": pistas * 3600 / servicio_medio if servicio_medio > 0 else math.inf,
+        "utilizacion": utilizacion,
+        "estable": utilizacion < 1,
+    }
+    if not resultado["estable"]:
+        # La cola crece sin límite: no hay régimen estacionario
+        resultado.update({
+            "prob_espera": 1.0,
+            "cola_media": math.inf,
+            "espera_media": math.inf,
+            **{f"espera_p{p}": math.inf for p in PERCENTILES}
+        })
+        return resultado
+
+    prob_espera = erlang_c(pistas, carga)
+    # Tasa a la que se vacía la cola cuando todas las pistas están ocupadas
+    tasa_salida = pistas / servicio_medio - llegadas
+    # Corrección de Allen-Cunneen para servicio no exponencial (cv² de llegadas = 1)
+    factor = (1 + servicio_cv2) / 2
+
+    resultado.update({
+        "prob_espera": prob_espera,
+        "espera_media": factor * prob_espera / tasa_salida,
+        **{f"espera_p{p}": factor * percentil_espera_mmc(prob_espera, tasa_salida, p / 100)
+           for p in PERCENTILES}
+    })
+    resultado["cola_media"] = llegadas * resultado["espera_media"]
+    return resultado
+
+
+def percentil_espera_mmc(prob_espera, tasa_salida, p):
+    """Percentil p de la espera en M/M/c, usando P(W > t) = C·e^(-(cμ-λ)t)"""
+    if prob_espera <= 1 - p:
+        return 0.0
+    return math.log(prob_espera / (1 - p)) / tasa_salida
+
+
+def pistas_necesarias(llegadas_hora, servicio_medio, servicio_cv2, objetivo, percentil=95):
+    """Mínimo número de pistas que mantiene el percentil de espera por debajo del objetivo (s)"""
+    for pistas in range(1, MAX_PISTAS_BUSQUEDA + 1):
+        modelo = modelo_cola(llegadas_hora, servicio_medio, servicio_cv2, pistas)
+        if modelo["estable"] and modelo[f"espera_p{percentil}"] <= objetivo:
+            return pistas, modelo
+    return None, None
+
+
+def parametros_servicio(tiempos_servicio=None, mezcla=None):
+    """
+    Media y cv² del tiempo de ocupación de pista según el modelo del planificador,
+    con secuencia aleatoria de operaciones (separación media)
+
+    Args:
+        tiempos_servicio: Distribuciones por (operacion, clase); por defecto TIEMPOS_SERVICIO
+        mezcla: Peso relativo de cada (operacion, clase); por defecto MEZCLA_TRAFICO
+    """
+    tiempos_servicio = tiempos_servicio or TIEMPOS_SERVICIO
+    mezcla = mezcla or MEZCLA_TRAFICO
+    total = sum(mezcla.values())
+    pesos = {tipo: n / total for tipo, n in mezcla.items() if n > 0}
+
+    separacion_media = sum(pesos[a] * pesos[b] * separacion(a, b) for a, b in product(pesos, pesos))
+    medias = {tipo: media(tiempos_servicio[tipo]) + separacion_media for tipo in pesos}
+    momento2 = sum(p * (varianza(tiempos_servicio[tipo]) + medias[tipo] ** 2) for tipo, p in pesos.items())
+
+    servicio_medio = sum(p * medias[tipo] for tipo, p in pesos.items())
+    return servicio_medio, (momento2 - servicio_medio ** 2) / servicio_medio ** 2
+
+
+def mostrar_modelo(modelo, titulo="MODELO ANALÍTICO"):
+    print(f"\n{titulo} ({modelo['pistas']} pistas, {modelo['llegadas_ops_hora']:.0f} ops/hora)")
+    print("-" * 60)
+    print(f"  • Servicio medio: {modelo['servicio_medio']:.2f}s (cv² {modelo['servicio_cv2']:.3f})")
+    print(f"  • Capacidad máxima: {modelo['capacidad_ops_hora']:.0f} ops/hora")
+    print(f"  • Utilización: {modelo['utilizacion']:.1%}")
+    if not modelo["estable"]:
+        print("  • Sistema saturado: la cola crece sin límite")
+        return
+    print(f"  • Probabilidad de esperar: {modelo['prob_espera']:.1%}")
+    print(f"  • Cola media: {modelo['cola_media']:.2f} vuelos")
+    print(f"  • Espera media: {modelo['espera_media']:.2f}s")
+    print("  • Espera " + ", ".join(f"p{p}: {modelo[f'espera_p{p}']:.2f}s" for p in PERCENTILES))
+
+
+async def comparar_con_torre():
+    """Contrasta el modelo con las estadísticas medidas por la torre en ejecución"""
+    medido = await enviar_comando(CONTROL_PORT, "estadisticas")
+    if medido.get("status") != "ok":
+        print(f"La torre rechazó la consulta: {medido.get('mensaje')}")
+        return
+    if not medido.get("llegadas_ops_hora") or not medido.get("servicio_medio"):
+        print("La torre aún no tiene operaciones completadas con las que comparar.")
+        return
+
+    modelo = modelo_cola(
+        medido["llegadas_ops_hora"], medido["servicio_medio"],
+        medido["servicio_cv2"], medido["pistas_totales"]
+    )
+    mostrar_modelo(modelo, "MODELO CON PARÁMETROS MEDIDOS")
+
+    print(f"\n{'MÉTRICA':<22} {'MODELO':>10} {'MEDIDO':>10}")
+    print("-" * 44)
+    # Utilización y llegadas se miden en la misma ventana (desde la primera solicitud), y la
+    # espera hasta la asignación de pista: la separación ya forma parte del tiempo de servicio
+    print(f"{'Utilización':<22} {modelo['utilizacion']:>10.1%} {medido['utilizacion_media']:>10.1%}")
+    print(f"{'Espera media (s)':<22} {modelo['espera_media']:>10.2f} {medido['espera_media']:>10.2f}")
+    for p in PERCENTILES:
+        print(f"{f'Espera p{p} (s)':<22} {modelo[f'espera_p{p}']:>10.2f} {medido[f'espera_p{p}']:>10.2f}")
+    print("\nNota: la torre no atiende en orden de llegada y puede tener pistas especializadas;")
+    print("el modelo asume pistas mixtas y servicio FIFO.")
+
+
+def positivo(tipo, incluir_cero=False):
+    """Conversor para argparse que solo acepta valores mayores que cero (o cero si se indica)"""
+    def convertir(texto):
+        try:
+            valor = tipo(texto)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"valor no válido: {texto}")
+        if not math.isfinite(valor):
+            raise argparse.ArgumentTypeError(f"valor no válido: {texto}")
+        if valor < 0 or (valor == 0 and not incluir_cero):
+            condicion = "no puede ser negativo" if incluir_cero else "debe ser mayor que cero"
+            raise argparse.ArgumentTypeError(f"{condicion}: {texto}")
+        return valor
+    return convertir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Modelo analítico de capacidad de pistas (M/M/c, M/G/c)")
+    parser.add_argument("--ops-hora", type=positivo(float), help="Tasa de llegadas en operaciones por hora")
+    parser.add_argument("--pistas", type=positivo(int), default=MAX_PISTAS, help=f"Número de pistas (por defecto {MAX_PISTAS})")
+    parser.add_argument("--servicio", type=positivo(float), help="Tiempo medio de ocupación de pista por operación (s)")
+    parser.add_argument("--cv2", type=positivo(float, incluir_cero=True), help="cv² del tiempo de servicio (1 = exponencial, M/M/c)")
+    parser.add_argument("--objetivo", type=positivo(float, incluir_cero=True), help="Espera máxima (s) para el percentil indicado")
+    parser.add_argument("--percentil", type=int, choices=PERCENTILES, default=95)
+    parser.add_argument("--comparar", action="store_true", help="Comparar con las estadísticas de la torre")
+    args = parser.parse_args()
+
+    if args.comparar:
+        try:
+            asyncio.run(comparar_con_torre())
+        except (OSError, asyncio.TimeoutError) as e:
+            print(f"No se pudo contactar con la torre: {e}")
+            sys.exit(1)
+        return
+
+    if args.ops_hora is None:
+        parser.error("se necesita --ops-hora (o --comparar)")
+
+    servicio_modelo, cv2_modelo = parametros_servicio()
+    servicio = args.servicio if args.servicio is not None else servicio_modelo
+    cv2 = args.cv2 if args.cv2 is not None else cv2_modelo
+
+    if args.objetivo is not None:
+        pistas, modelo = pistas_necesarias(args.ops_hora, servicio, cv2, args.objetivo, args.percentil)
+        if pistas is None:
+            print(f"Ni con {MAX_PISTAS_BUSQUEDA} pistas se consigue p{args.percentil} ≤ {args.objetivo}s.")
+            sys.exit(1)
+        print(f"Se necesitan {pistas} pistas para p{args.percentil} de espera ≤ {args.objetivo}s "
+              f"a {args.ops_hora:.0f} ops/hora.")
+        mostrar_modelo(modelo)
+    else:
+        mostrar_modelo(modelo_cola(args.ops_hora, servicio, cv2, args.pistas))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+control.py - Canal de control local entre el orquestador y los componentes
+"""
+
+import asyncio
+import inspect
+import json
+import sys
+import time
+
+HOST = '127.0.0.1'
+
+
+def empaquetar(mensaje):
+    """Serializa un diccionario con el prefijo de longitud de 4 bytes que usa el sistema"""
+    datos = json.dumps(mensaje).encode()
+    return len(datos).to_bytes(4, byteorder='big') + datos
+
+
+async def leer_mensaje(reader):
+    """Lee un mensaje con prefijo de longitud (lanza IncompleteReadError si se cierra la conexión)"""
+    longitud = int.from_bytes(await reader.readexactly(4), byteorder='big')
+    return json.loads((await reader.readexactly(longitud)).decode())
+
+
+class ServidorControl:
+    """Servidor de comandos de un componente: cada petición recibe una respuesta como acuse"""
+
+    def __init__(self, nombre, puerto):
+        self.nombre = nombre
+        self.puerto = puerto
+        self.comandos = {"ping": self._ping}
+        self.servidor = None
+
+    def registrar(self, comando, manejador):
+        """
+        Registra un comando
+
+        Args:
+            comando: Nombre del comando
+            manejador: Función (o corrutina) que recibe los argumentos del mensaje y devuelve un dict
+        """
+        self.comandos[comando] = manejador
+
+    async def iniciar(self):
+        self.servidor = await asyncio.start_server(self._manejar_conexion, HOST, self.puerto)
+        return self.servidor
+
+    def _ping(self):
+        return {"componente": self.nombre, "listo": True}
+
+    async def _manejar_conexion(self, reader, writer):
+        try:
+            while True:
+                try:
+                    peticion = await leer_mensaje(reader)
+                except asyncio.IncompleteReadError:
+                    break
+                writer.write(empaquetar(await self._ejecutar(peticion)))
+                await writer.drain()
+        except (ConnectionError, json.JSONDecodeError, asyncio.CancelledError):
+            # CancelledError: el componente se está deteniendo
+            pass
+        finally:
+            writer.close()
+
+    async def _ejecutar(self, peticion):
+        argumentos = dict(peticion)
+        comando = argumentos.pop("comando", None)
+        manejador = self.comandos.get(comando)
+        if manejador is None:
+            return {"status": "error", "mensaje": f"Comando desconocido: {comando}"}
+
+        # Los argumentos se comprueban antes de llamar: un TypeError dentro del manejador
+        # es un fallo del componente, no de la petición
+        try:
+            inspect.signature(manejador).bind(**argumentos)
+        except TypeError as e:
+            return {"status": "error", "mensaje": f"Argumentos no válidos para {comando}: {e}"}
+
+        try:
+            resultado = manejador(**argumentos)
+            if inspect.isawaitable(resultado):
+                resultado = await resultado
+        except Exception as e:
+            return {"status": "error", "mensaje": f"Error ejecutando {comando}: {e}"}
+
+        return {"status": "ok", **(resultado or {})}
+
+
+async def enviar_comando(puerto, comando, timeout=5, **argumentos):
+    """Envía un comando a un componente y espera su acuse"""
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(HOST, puerto), timeout)
+    try:
+        writer.write(empaquetar({"comando": comando, **argumentos}))
+        await writer.drain()
+        return await asyncio.wait_for(leer_mensaje(reader), timeout)
+    finally:
+        writer.close()
+
+
+async def esperar_listo(puerto, timeout=10, intervalo=0.1):
+    """Sondea un componente hasta que responde al ping o se agota el tiempo"""
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        try:
+            respuesta = await enviar_comando(puerto, "ping", timeout=intervalo * 10)
+            if respuesta.get("listo"):
+                return True
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+            pass
+        await asyncio.sleep(intervalo)
+    return False
+
+
+def _interpretar_valor(valor):
+    try:
+        return json.loads(valor)
+    except json.JSONDecodeError:
+        return valor
+
+
+if __name__ == "__main__":
+    # Uso: python control.py <puerto> <comando> [clave=valor ...]
+    # Ejemplo: python control.py 5001 refresco intervalo=0.5
+    if len(sys.argv) < 3 or not sys.argv[1].isdigit():
+        print("Uso: python control.py <puerto> <comando> [clave=valor ...]")
+        sys.exit(1)
+
+    argumentos = {}
+    for par in sys.argv[3:]:
+        clave, _, valor = par.partition("=")
+        argumentos[clave] = _interpretar_valor(valor)
+
+    try:
+        respuesta = asyncio.run(enviar_comando(int(sys.argv[1]), sys.argv[2], **argumentos))
+    except (OSError, asyncio.TimeoutError) as e:
+        print(f"No se pudo contactar con el componente: {e}")
+        sys.exit(1)
+    print(json.dumps(respuesta, indent=2, ensure_ascii=False))
@@ -0,0 +1,212 @@
+"""
+informe.py - Informe del historial de vuelos leído en streaming (memoria constante)
+"""
+
+import csv
+import json
+import math
+
+HISTORIAL_ARCHIVO = "historial_vuelos.jsonl"
+TAMANO_PAGINA = 20
+PERCENTILES = (50, 95, 99)
+CAMPOS = ["id", "tipo", "clase", "pista", "duracion", "espera", "hora", "fin"]
+
+
+def leer_historial(ruta=HISTORIAL_ARCHIVO):
+    """Genera los registros del historial (un JSON por línea) sin cargar el archivo entero"""
+    with open(ruta, "r", encoding="utf-8") as f:
+        for linea in f:
+            linea = linea.strip()
+            if not linea:
+                continue
+            try:
+                yield json.loads(linea)
+            except json.JSONDecodeError:
+                # Una línea cortada (p.ej. al detener el monitor) no invalida el resto
+                continue
+
+
+def filtrar(registros, filtro):
+    """
+    Filtra registros por campos exactos; el campo 'id' se compara por prefijo
+
+    Args:
+        registros: Iterable de registros del historial
+        filtro: Diccionario campo -> valor (como texto)
+    """
+    for registro in registros:
+        if all(
+            str(registro.get(campo, "")).startswith(valor) if campo == "id"
+            else str(registro.get(campo, "")) == valor
+            for campo, valor in filtro.items()
+        ):
+            yield registro
+
+
+def interpretar_filtro(texto):
+    """Convierte 'tipo=aterrizaje pista=1' en un diccionario de filtro"""
+    filtro = {}
+    for par in texto.replace(",", " ").split():
+        campo, _, valor = par.partition("=")
+        if campo in CAMPOS and valor:
+            filtro[campo] = valor
+    return filtro
+
+
+class Histograma:
+    """Percentiles aproximados en memoria constante: cubetas logarítmicas con error relativo ~1%"""
+
+    def __init__(self, minimo=0.001, precision=0.02):
+        self.minimo = minimo
+        self.base = math.log1p(precision)
+        self.cubetas = {}
+        self.total = 0
+        self.suma = 0.0
+
+    def agregar(self, valor):
+        indice = 0 if valor <= self.minimo else int(math.log(valor / self.minimo) / self.base) + 1
+        self.cubetas[indice] = self.cubetas.get(indice, 0) + 1
+        self.total += 1
+        self.suma += valor
+
+    def media(self):
+        return self.suma / self.total if self.total else 0
+
+    def percentil(self, p):
+        if not self.total:
+            return 0
+        objetivo = p / 100 * self.total
+        acumulado = 0
+        for indice in sorted(self.cubetas):
+            acumulado += self.cubetas[indice]
+            if acumulado >= objetivo:
+                if indice == 0:
+                    return 0.0
+                # Punto medio geométrico de la cubeta
+                return self.minimo * math.exp((indice - 0.5) * self.base)
+        return 0
+
+
+def resumir(registros):
+    """Calcula el resumen del historial en una sola pasada"""
+    total = 0
+    por_tipo = {}
+    ocupacion_pistas = {}
+    esperas = Histograma()
+    duraciones = Histograma()
+    primer_inicio = None
+    ultimo_fin = None
+
+    for registro in registros:
+        total += 1
+        tipo = registro.get("tipo", "---")
+        por_tipo[tipo] = por_tipo.get(tipo, 0) + 1
+
+        duracion = registro.get("duracion", 0) or 0
+        esperas.agregar(registro.get("espera", 0) or 0)
+        duraciones.agregar(duracion)
+
+        pista = str(registro.get("pista", "---"))
+        ocupacion_pistas[pista] = ocupacion_pistas.get(pista, 0) + duracion
+
+        fin = registro.get("fin")
+        if fin is not None:
+            inicio = fin - duracion
+            primer_inicio = inicio if primer_inicio is None else min(primer_inicio, inicio)
+            ultimo_fin = fin if ultimo_fin is None else max(ultimo_fin, fin)
+
+    periodo = ultimo_fin - primer_inicio if primer_inicio is not None else 0
+    return {
+        "total": total,
+        "por_tipo": por_tipo,
+        "esperas": esperas,
+        "duraciones": duraciones,
+        "periodo": periodo,
+        "rendimiento_ops_hora": total * 3600 / periodo if periodo > 0 else 0,
+        "utilizacion_pistas": {
+            pista: ocupada / periodo if periodo > 0 else 0
+            for pista, ocupada in sorted(ocupacion_pistas.items())
+        }
+    }
+
+
+def mostrar_resumen(resumen):
+    print("\n╔════════════════════════════════════════════════════════════╗")
+    print("║                 RESUMEN DE VUELOS GESTIONADOS              ║")
+    print("╚════════════════════════════════════════════════════════════╝")
+    tipos = ", ".join(f"{tipo}: {n}" for tipo, n in sorted(resumen["por_tipo"].items()))
+    print(f"  • Operaciones: {resumen['total']} ({tipos})")
+    print(f"  • Periodo de actividad: {resumen['periodo']:.1f}s")
+    print(f"  • Rendimiento: {resumen['rendimiento_ops_hora']:.0f} ops/hora")
+    for nombre, histograma in (("Espera", resumen["esperas"]), ("Duración", resumen["duraciones"])):
+        percentiles = ", ".join(f"p{p}: {histograma.percentil(p):.2f}s" for p in PERCENTILES)
+        print(f"  • {nombre}: media {histograma.media():.2f}s, {percentiles}")
+    if resumen["utilizacion_pistas"]:
+        print("  • Utilización por pista: " + ", ".join(
+            f"pista {pista}: {utilizacion:.1%}" for pista, utilizacion in resumen["utilizacion_pistas"].items()
+        ))
+    print()
+
+
+def _cabecera_tabla():
+    print("\n╔════════════════╦════════════╦═══════╦═════════╦═════════╦════════════╗")
+    print("║   ID VUELO     ║  OPERACIÓN ║ PISTA ║ TIEMPO  ║ ESPERA  ║   HORA     ║")
+    print("╠════════════════╬════════════╬═══════╬═════════╬═════════╬════════════╣")
+
+
+def _fila_tabla(vuelo):
+    idv = str(vuelo.get("id", "---"))[:14].ljust(14)
+    tipo = vuelo.get("tipo", "---").ljust(10)
+    pista = str(vuelo.get("pista", "---")).center(5)
+    duracion = f'{vuelo.get("duracion", 0):.2f}s'.rjust(7)
+    espera = f'{vuelo.get("espera", 0):.2f}s'.rjust(7)
+    hora = vuelo.get("hora", "--:--:--")[-8:]
+    print(f"║ {idv} ║ {tipo:^10} ║ {pista} ║ {duracion} ║ {espera} ║ {hora:^10} ║")
+
+
+def _pie_tabla():
+    print("╚════════════════╩════════════╩═══════╩═════════╩═════════╩════════════╝")
+
+
+def mostrar_detalle(registros, tamano_pagina=TAMANO_PAGINA, pedir=input):
+    """Muestra los registros por páginas; solo se mantiene en memoria la página actual"""
+    pagina = 0
+    en_pagina = 0
+    for registro in registros:
+        if en_pagina == 0:
+            pagina += 1
+            _cabecera_tabla()
+        _fila_tabla(registro)
+        en_pagina += 1
+
+        if en_pagina == tamano_pagina:
+            _pie_tabla()
+            en_pagina = 0
+            if pedir(f"Página {pagina} - Enter para continuar, 'q' para salir: ").strip().lower() == "q":
+                return
+
+    if en_pagina:
+        _pie_tabla()
+    elif pagina == 0:
+        print("No hay vuelos que coincidan.")
+
+
+def exportar(registros, destino, formato="csv"):
+    """Exporta registros a CSV o JSON escribiendo a medida que se leen. Devuelve cuántos se exportaron"""
+    total = 0
+    with open(destino, "w", encoding="utf-8", newline="") as f:
+        if formato == "csv":
+            escritor = csv.DictWriter(f, fieldnames=CAMPOS, extrasaction="ignore")
+            escritor.writeheader()
+            for registro in registros:
+                escritor.writerow(registro)
+                total += 1
+        elif formato == "json":
+            f.write("[")
+            for registro in registros:
+                f.write(("," if total else "") + "\n  " + json.dumps(registro, ensure_ascii=False))
+                total += 1
+            f.write("\n]\n")
+        else:
+            raise ValueError(f"Formato de exportación desconocido: {formato}")
+    return total
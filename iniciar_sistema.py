@@ -4,7 +4,15 @@ import signal
 import subprocess
 import sys
 import time
-import json
+
+from control import enviar_comando, esperar_listo
+from informe import (HISTORIAL_ARCHIVO, exportar, filtrar, interpretar_filtro, leer_historial,
+                     mostrar_detalle, mostrar_resumen, resumir)
+
+MONITOR_CONTROL_PORT = 5001
+TORRE_CONTROL_PORT = 5003
+TIMEOUT_ARRANQUE = 15  # Segundos máximos para que un componente confirme que está listo
+TIMEOUT_VACIADO = 60  # Segundos máximos para que el monitor registre las últimas operaciones
 
 def mostrar_banner():
     banner = """
@@ -23,32 +31,80 @@ def mostrar_banner():
     """
     print(banner)
 
-def mostrar_tabla_final():
+def mostrar_informe_final():
+    """Resumen del historial, calculado leyendo el archivo registro a registro"""
     try:
-        with open("historial_vuelos.json", "r", encoding="utf-8") as f:
-            historial = json.load(f)
-        if not historial:
-            print("No hay vuelos registrados.")
-            return
-
-        print("\n╔════════════════════════════════════════════════════════════╗")
-        print("║                  HISTORIAL DE VUELOS GESTIONADOS           ║")
-        print("╠════════════════╦════════════╦═══════╦═════════╦════════════╣")
-        print("║   ID VUELO     ║  OPERACIÓN ║ PISTA ║ TIEMPO  ║   HORA     ║")
-        print("╠════════════════╬════════════╬═══════╬═════════╬════════════╣")
-        for vuelo in historial[:]:
-            idv = vuelo.get("id", "---").ljust(14)
-            tipo = vuelo.get("tipo", "---").ljust(10)
-            pista = str(vuelo.get("pista", "---")).center(5)
-            duracion = f'{vuelo.get("duracion", 0):.2f}s'.rjust(7)
-            hora = vuelo.get("hora", "--:--:--")[-8:]
-            print(f"║ {idv} ║ {tipo:^10} ║ {pista} ║ {duracion} ║ {hora:^10} ║")
-        print("╚════════════════╩════════════╩═══════╩═════════╩════════════╝\n")
-
+        resumen = resumir(leer_historial())
     except FileNotFoundError:
-        print("[!] No se encontró el historial de vuelos (historial_vuelos.json).")
+        print(f"[!] No se encontró el historial de vuelos ({HISTORIAL_ARCHIVO}).")
+        return
     except Exception as e:
         print(f"[!] Error al leer historial: {e}")
+        return
+
+    if not resumen["total"]:
+        print("No hay vuelos registrados.")
+        return
+    mostrar_resumen(resumen)
+
+def pedir_filtro():
+    texto = input("Filtro (ej. tipo=aterrizaje pista=1 id=IB; vacío = todos): ").strip()
+    return interpretar_filtro(texto)
+
+def ver_detalle_historial():
+    filtro = pedir_filtro()
+    try:
+        mostrar_detalle(filtrar(leer_historial(), filtro))
+    except FileNotFoundError:
+        print(f"[!] No se encontró el historial de vuelos ({HISTORIAL_ARCHIVO}).")
+
+def exportar_historial():
+    formato = input("Formato de exportación (csv/json) [csv]: ").strip().lower() or "csv"
+    if formato not in ("csv", "json"):
+        print("Formato no válido.")
+        return
+    destino = input(f"Archivo de destino [historial_exportado.{formato}]: ").strip() or f"historial_exportado.{formato}"
+    filtro = pedir_filtro()
+    try:
+        total = exportar(filtrar(leer_historial(), filtro), destino, formato)
+        print(f"[+] {total} vuelos exportados a {destino}")
+    except FileNotFoundError:
+        print(f"[!] No se encontró el historial de vuelos ({HISTORIAL_ARCHIVO}).")
+    except OSError as e:
+        print(f"[!] Error al exportar historial: {e}")
+
+async def esperar_componentes(componentes):
+    """Espera a que todos los componentes respondan al ping de su canal de control"""
+    resultados = await asyncio.gather(*(
+        esperar_listo(puerto, timeout=TIMEOUT_ARRANQUE) for _, _, puerto in componentes
+    ))
+    for (nombre, proceso, _), listo in zip(componentes, resultados):
+        if not listo:
+            estado = "ha terminado" if proceso.poll() is not None else "no responde"
+            print(f"[!] El componente {nombre} {estado}.")
+            return False
+    return True
+
+async def comando_monitor(comando, **argumentos):
+    """Envía un comando al monitor y espera su acuse"""
+    try:
+        respuesta = await enviar_comando(MONITOR_CONTROL_PORT, comando, **argumentos)
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+        print(f"[!] El monitor no respondió al comando '{comando}': {e}")
+        return None
+    if respuesta.get("status") != "ok":
+        print(f"[!] El monitor rechazó el comando '{comando}': {respuesta.get('mensaje')}")
+    return respuesta
+
+async def esperar_vaciado_monitor():
+    """Pide al monitor que confirme que ha registrado las últimas operaciones completadas"""
+    respuesta = await comando_monitor("vaciar", timeout=TIMEOUT_VACIADO + 5, limite=TIMEOUT_VACIADO)
+    if respuesta is None:
+        return
+
+    if not respuesta.get("vaciado"):
+        print(f"[!] El monitor no confirmó todas las operaciones a tiempo "
+              f"({respuesta.get('pendientes', 0)} pendientes, {respuesta.get('activos', 0)} activas).")
 
 async def iniciar_componentes(ruta_monitor, ruta_torre, ruta_avion, simular_trafico, num_aviones):
     procesos = []
@@ -62,21 +118,30 @@ async def iniciar_componentes(ruta_monitor, ruta_torre, ruta_avion, simular_traf
 1. Simular más aviones
 2. Modo manual (lanzar aviones individuales desde otra terminal)
 3. Salir del sistema
+4. Ver detalle del historial (paginado y con filtros)
+5. Exportar historial (CSV/JSON)
 
 """
 
     try:
+        # El monitor añade al historial sin truncarlo: cada arranque del sistema empieza uno nuevo
+        open(HISTORIAL_ARCHIVO, "w", encoding="utf-8").close()
+
         print("[+] Iniciando monitor de vuelos...")
         monitor_proceso = subprocess.Popen([sys.executable, ruta_monitor])
         procesos.append(("Monitor", monitor_proceso))
 
-        await asyncio.sleep(2)
-
         print("[+] Iniciando torre de control...")
         torre_proceso = subprocess.Popen([sys.executable, ruta_torre])
         procesos.append(("Torre de Control", torre_proceso))
 
-        await asyncio.sleep(3)
+        # Ambos arrancan en paralelo; el monitor se suscribe a la torre en cuanto esta escucha
+        listos = await esperar_componentes([
+            ("Monitor", monitor_proceso, MONITOR_CONTROL_PORT),
+            ("Torre de Control", torre_proceso, TORRE_CONTROL_PORT)
+        ])
+        if not listos:
+            raise KeyboardInterrupt
 
         sistema_activo = True
 
@@ -89,23 +154,25 @@ async def iniciar_componentes(ruta_monitor, ruta_torre, ruta_avion, simular_traf
                 while simulador_proceso.poll() is None:
                     await asyncio.sleep(1)
 
-                await asyncio.sleep(3)
-
-                monitor_lock = os.path.join(os.path.dirname(__file__), ".monitor_lock")
-                with open(monitor_lock, "w") as f:
-                    f.write("pause")
+                # El monitor responde cuando ha registrado (y guardado) las últimas operaciones
+                await esperar_vaciado_monitor()
 
-                await asyncio.sleep(2)  # Espera para asegurar que el historial esté actualizado
+                # Tras el acuse el monitor ya no pinta, así que la tabla no se mezcla con la interfaz
+                await comando_monitor("pausar")
 
-                mostrar_tabla_final()
+                mostrar_informe_final()
 
-                print(mensaje_simulacion.format(num_aviones=num_aviones))
-                opcion = input("Seleccione una opción (1-3): ").strip()
+                while True:
+                    print(mensaje_simulacion.format(num_aviones=num_aviones))
+                    opcion = input("Seleccione una opción (1-5): ").strip()
+                    if opcion == "4":
+                        ver_detalle_historial()
+                    elif opcion == "5":
+                        exportar_historial()
+                    else:
+                        break
 
-                try:
-                    os.remove(monitor_lock)
-                except:
-                    pass
+                await comando_monitor("reanudar")
 
                 if opcion == "1":
                     num_input = input("Número de aviones a simular: ").strip()
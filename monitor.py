@@ -1,11 +1,16 @@
 import asyncio
 import json
 import logging
-import socket
-import time
 import os
+import time
+import sys
 from datetime import datetime
-from collections import deque
+from collections import Counter, deque
+from itertools import islice
+
+from control import ServidorControl, empaquetar, leer_mensaje
+from informe import HISTORIAL_ARCHIVO
+from renderizador import RenderizadorTerminal
 
 # Configuración de logging
 logging.basicConfig(
@@ -15,209 +20,429 @@ logging.basicConfig(
 )
 
 HOST = '127.0.0.1'
-PORT = 5001
+CONTROL_PORT = 5001
+TORRE_PUBSUB_PORT = 5002
+TEMAS = ["estado", "completados", "estadisticas"]
 MAX_HISTORY = 100
+MAX_FILAS_VISIBLES = 10  # Filas máximas por tabla; el resto se resume con contadores
+LINEAS_FIJAS_UI = 27  # Líneas de la interfaz que no son filas de tabla (cabecera, títulos, resúmenes)
+LOG_PANTALLA_COMPLETA = "monitor.log"  # En pantalla completa el log no puede escribirse en el terminal
+REFRESCO_UI = 1.0  # Segundos entre frames de la interfaz
+REFRESCO_MINIMO = 0.1
+CAMPOS_ESTADISTICAS = (
+    "tiempo_espera_promedio", "operaciones_completadas",
+    "capacidad_teorica_ops_hora", "capacidad_lograda_ops_hora"
+)
 VERBOSE = False  # ← Cambia esto a True si quieres ver detalles de conexión
 
 class MonitorVuelos:
-    def __init__(self):
+    def __init__(self, intervalo_refresco=REFRESCO_UI, pantalla_completa=False):
         self.vuelos_pendientes = {}
         self.vuelos_activos = {}
-        self.vuelos_completados = {}
+        # Solo se guardan en memoria las últimas operaciones; el historial completo va a disco
         self.historial = deque(maxlen=MAX_HISTORY)
+        # Solo lo escribe el monitor que abre el canal de control (ver iniciar)
+        self.archivo_historial = None
+        self.resumen_pendientes = Counter()
+        self.completados_recibidos = 0
+        self.completados_en_estado = 0  # Operaciones completadas según el último mensaje de estado
+        # Secuencia del último completado que ya no hay que esperar (recibido o publicado antes
+        # de suscribirnos); la torre numera cada operación completada
+        self.secuencia_completados = 0
+        self.estado_recibido = False
 
         self.stats = {
             "tiempo_espera_promedio": 0,
             "operaciones_completadas": 0,
             "pistas_disponibles": 0,
             "pistas_totales": 0,
+            "capacidad_teorica_ops_hora": 0,
+            "capacidad_lograda_ops_hora": 0,
             "ultima_actualizacion": datetime.now().strftime("%H:%M:%S")
         }
 
         self.running = True
-        self.lock_file = os.path.join(os.path.dirname(__file__), '.monitor_lock')
-        logging.info("Monitor de vuelos iniciado")
+        self.intervalo_refresco = intervalo_refresco
+        # El control de cursor solo se usa si el monitor tiene el terminal para él solo;
+        # en la consola compartida con la torre y los aviones se reimprime el frame si cambia
+        self.renderizador = RenderizadorTerminal(
+            ["encabezado", "activos", "pendientes", "historial"], ansi=pantalla_completa
+        )
+        self.filas_visibles = MAX_FILAS_VISIBLES
+        # La interfaz solo pinta mientras este evento está activo (pausar/reanudar)
+        self.reanudado = asyncio.Event()
+        self.reanudado.set()
+        self.despertar_ui = asyncio.Event()
 
-    async def iniciar_servidor(self):
-        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        server.bind((HOST, PORT))
-        server.listen(1)
-        server.setblocking(False)
+        # Se sustituye por uno nuevo tras cada actualización para despertar a quien espere
+        self.actualizado = asyncio.Event()
+        self.control = ServidorControl("monitor", CONTROL_PORT)
+        self.control.registrar("vaciar", self._cmd_vaciar)
+        self.control.registrar("pausar", self._cmd_pausar)
+        self.control.registrar("reanudar", self._cmd_reanudar)
+        self.control.registrar("guardar_historial", self._cmd_guardar_historial)
+        self.control.registrar("estadisticas", self._cmd_estadisticas)
+        self.control.registrar("refresco", self._cmd_refresco)
+        self.control.registrar("nivel_log", self._cmd_nivel_log)
+        logging.info("Monitor de vuelos iniciado")
 
-        logging.info(f"Servidor del monitor iniciado en {HOST}:{PORT}")
-        loop = asyncio.get_running_loop()
+    async def iniciar(self):
+        self.renderizador.iniciar()
         asyncio.create_task(self._actualizar_ui())
 
+        try:
+            await self.control.iniciar()
+            logging.info(f"Canal de control del monitor en {HOST}:{CONTROL_PORT}")
+            # Se abre para añadir: quien quiera empezar un historial nuevo lo trunca antes
+            # (el orquestador lo hace al arrancar el sistema)
+            self.archivo_historial = open(HISTORIAL_ARCHIVO, "a", encoding="utf-8")
+        except OSError as e:
+            # Puede haber otro monitor con el canal de control; este sigue como suscriptor
+            # y no escribe el historial para no mezclar sus registros con los del primero
+            logging.warning(f"No se pudo abrir el canal de control, no se guardará historial: {e}")
+
+        # El monitor es un suscriptor más de la torre: si la conexión cae, reintenta
         while self.running:
             try:
-                client_socket, addr = await loop.sock_accept(server)
+                reader, writer = await asyncio.open_connection(HOST, TORRE_PUBSUB_PORT)
+            except OSError:
                 if VERBOSE:
-                    logging.info(f"Conexión aceptada desde {addr}")
-                asyncio.create_task(self._manejar_conexion(client_socket))
-            except Exception as e:
-                logging.error(f"Error aceptando conexión: {e}")
+                    logging.warning("Torre no disponible, reintentando...")
                 await asyncio.sleep(1)
+                continue
 
-        server.close()
-
-    async def _manejar_conexion(self, client_socket):
-        client_socket.setblocking(False)
-        loop = asyncio.get_running_loop()
+            logging.info(f"Suscrito a la torre en {HOST}:{TORRE_PUBSUB_PORT}")
+            await self._recibir_actualizaciones(reader, writer)
+            await asyncio.sleep(1)
 
+    async def _recibir_actualizaciones(self, reader, writer):
         try:
+            writer.write(empaquetar({"temas": TEMAS}))
+            await writer.drain()
+
             while self.running:
-                size_bytes = await loop.sock_recv(client_socket, 4)
-                if not size_bytes:
-                    break
-                size = int.from_bytes(size_bytes, byteorder='big')
-                data = b''
-                while len(data) < size:
-                    chunk = await loop.sock_recv(client_socket, size - len(data))
-                    if not chunk:
-                        break
-                    data += chunk
-                if len(data) == size:
-                    self._procesar_actualizacion(data)
-                else:
-                    logging.error("Error recibiendo datos completos")
-                    break
+                self._procesar_actualizacion(await leer_mensaje(reader))
+        except asyncio.IncompleteReadError:
+            if VERBOSE:
+                logging.warning("Conexión cerrada por la torre")
         except ConnectionResetError:
             if VERBOSE:
                 logging.warning("Conexión cerrada por el lado remoto")
         except Exception as e:
             logging.error(f"Error manejando conexión: {e}")
         finally:
-            client_socket.close()
+            writer.close()
             if VERBOSE:
                 logging.info("Conexión cerrada")
 
-    def _procesar_actualizacion(self, data):
+    def _procesar_actualizacion(self, mensaje):
         try:
-            actualizacion = json.loads(data.decode())
-
-            self.vuelos_pendientes = actualizacion.get('vuelos_pendientes', {})
-            self.vuelos_activos = actualizacion.get('vuelos_activos', {})
-            nuevos_completados = actualizacion.get('vuelos_completados', {})
-
-            for id_vuelo, info in nuevos_completados.items():
-                self.historial.append({
-                    'id': id_vuelo,
-                    'tipo': info.get('tipo', '---'),
-                    'hora': datetime.now().strftime("%H:%M:%S"),
-                    'duracion': round(info.get('duracion', 0), 2),
-                    'espera': round(info.get('tiempo_espera', 0), 2),
-                    'pista': info.get('pista', '---')
-                })
-                logging.info(f"Registro añadido al historial: {id_vuelo}")
-
-            self.vuelos_completados.update(nuevos_completados)
-
-            self.stats = {
-                "tiempo_espera_promedio": actualizacion.get('estadisticas', {}).get('tiempo_espera_promedio', 0),
-                "operaciones_completadas": actualizacion.get('estadisticas', {}).get('operaciones_completadas', 0),
-                "pistas_disponibles": actualizacion.get('pistas_disponibles', 0),
-                "pistas_totales": actualizacion.get('pistas_totales', 0),
-                "ultima_actualizacion": actualizacion.get('timestamp', datetime.now().strftime("%H:%M:%S"))
-            }
-
-            self._guardar_historial_json()
+            tema = mensaje.get('tema')
+            datos = mensaje.get('datos', {})
+            # La torre publica el estado en cada ciclo aunque no cambie: solo se marcan para
+            # repintar (y se actualiza la hora) las secciones cuyos datos han cambiado
+            cambio = False
+
+            if tema == "suscripcion":
+                # Primer mensaje de cada conexión: lo publicado antes no nos llegará
+                self.secuencia_completados = datos.get('completados_publicados', 0)
+
+            elif tema == "estado":
+                self.completados_en_estado = datos.get('operaciones_completadas', 0)
+                self.estado_recibido = True
+                pendientes = datos.get('vuelos_pendientes', {})
+                activos = datos.get('vuelos_activos', {})
+                pistas = (datos.get('pistas_disponibles', 0), datos.get('pistas_totales', 0))
+                if (
+                    pendientes != self.vuelos_pendientes or activos != self.vuelos_activos
+                    or pistas != (self.stats["pistas_disponibles"], self.stats["pistas_totales"])
+                ):
+                    self.vuelos_pendientes = pendientes
+                    self.vuelos_activos = activos
+                    self.resumen_pendientes = Counter(info.get('tipo') for info in pendientes.values())
+                    self.stats["pistas_disponibles"], self.stats["pistas_totales"] = pistas
+                    self.renderizador.marcar_sucia("encabezado", "activos", "pendientes")
+                    cambio = True
+
+            elif tema == "completados":
+                registros = []
+                for id_vuelo, info in datos.items():
+                    registros.append({
+                        'id': id_vuelo,
+                        'tipo': info.get('tipo', '---'),
+                        'clase': info.get('clase', '---'),
+                        'hora': datetime.now().strftime("%H:%M:%S"),
+                        'duracion': round(info.get('duracion', 0), 2),
+                        'espera': round(info.get('tiempo_espera', 0), 2),
+                        'pista': info.get('pista', '---'),
+                        'fin': info.get('fin', time.time())
+                    })
+                    logging.debug(f"Registro añadido al historial: {id_vuelo}")
+
+                self.historial.extend(registros)
+                self.completados_recibidos += len(datos)
+                self.secuencia_completados = max(
+                    [self.secuencia_completados] + [info.get('secuencia', 0) for info in datos.values()]
+                )
+                self.renderizador.marcar_sucia("historial")
+                self._guardar_historial(registros)
+                cambio = bool(registros)
+
+            elif tema == "estadisticas":
+                nuevas = {campo: datos.get(campo, 0) for campo in CAMPOS_ESTADISTICAS}
+                if any(self.stats[campo] != valor for campo, valor in nuevas.items()):
+                    self.stats.update(nuevas)
+                    self.renderizador.marcar_sucia("encabezado")
+                    cambio = True
+
+            if cambio:
+                self.stats["ultima_actualizacion"] = mensaje.get('timestamp', datetime.now().strftime("%H:%M:%S"))
 
         except Exception as e:
             logging.error(f"Error procesando actualización: {e}")
+        finally:
+            self.actualizado.set()
+            self.actualizado = asyncio.Event()
+
+    def _vaciado(self):
+        """Indica si la torre está inactiva y el monitor ha registrado todas sus operaciones"""
+        # Se compara la secuencia, no totales acumulados: un lote perdido (entregado a otro
+        # suscriptor antes de reconectar) o dos completados del mismo ID en un lote no bloquean
+        # los vaciados siguientes. La referencia es el recuento del propio mensaje de estado,
+        # porque los completados llegan en mensajes posteriores
+        return (
+            self.estado_recibido
+            and not self.vuelos_pendientes
+            and not self.vuelos_activos
+            and self.secuencia_completados >= self.completados_en_estado
+        )
+
+    def _cmd_pausar(self):
+        # La interfaz pinta de forma síncrona, así que tras el acuse no se pinta ningún frame más
+        self.reanudado.clear()
+        return {"pausado": True}
 
-    def _guardar_historial_json(self):
+    def _cmd_reanudar(self):
+        if not self.reanudado.is_set():
+            # Otro proceso ha escrito en la consola durante la pausa
+            self.renderizador.invalidar()
+            self.reanudado.set()
+        return {"pausado": False}
+
+    def _cmd_guardar_historial(self):
+        if self.archivo_historial is None:
+            return {"guardado": False, "mensaje": "este monitor no escribe el historial", "archivo": HISTORIAL_ARCHIVO}
         try:
-            with open("historial_vuelos.json", "w", encoding="utf-8") as f:
-                json.dump(list(self.historial), f, indent=2, ensure_ascii=False)
+            self.archivo_historial.flush()
+            os.fsync(self.archivo_historial.fileno())
+        except (OSError, ValueError) as e:
+            raise RuntimeError(f"no se pudo guardar el historial: {e}")
+        return {"guardado": True, "registros": self.completados_recibidos, "archivo": HISTORIAL_ARCHIVO}
+
+    def _cmd_estadisticas(self):
+        return {
+            **self.stats,
+            "vuelos_pendientes": len(self.vuelos_pendientes),
+            "vuelos_activos": len(self.vuelos_activos),
+            "operaciones_registradas": self.completados_recibidos,
+            "registros_historial": len(self.historial),
+            "intervalo_refresco": self.intervalo_refresco,
+            "pausado": not self.reanudado.is_set()
+        }
+
+    def _cmd_refresco(self, intervalo):
+        self.intervalo_refresco = max(REFRESCO_MINIMO, float(intervalo))
+        self.despertar_ui.set()
+        return {"intervalo_refresco": self.intervalo_refresco}
+
+    def _cmd_nivel_log(self, nivel):
+        nivel = str(nivel).upper()
+        if not isinstance(logging.getLevelName(nivel), int):
+            raise ValueError(f"nivel de log desconocido: {nivel}")
+        logging.getLogger().setLevel(nivel)
+        return {"nivel_log": nivel}
+
+    async def _cmd_vaciar(self, limite=30):
+        """Espera a que lleguen las últimas operaciones completadas y las confirma"""
+        fin = time.monotonic() + limite
+        while not self._vaciado():
+            restante = fin - time.monotonic()
+            if restante <= 0:
+                break
+            try:
+                await asyncio.wait_for(self.actualizado.wait(), restante)
+            except asyncio.TimeoutError:
+                pass
+
+        return {
+            "vaciado": self._vaciado(),
+            "operaciones_registradas": self.completados_recibidos,
+            "pendientes": len(self.vuelos_pendientes),
+            "activos": len(self.vuelos_activos)
+        }
+
+    def _guardar_historial(self, registros):
+        # Se añaden solo los registros nuevos (JSON por línea): el coste no depende del tamaño del historial
+        if self.archivo_historial is None:
+            return
+        try:
+            for registro in registros:
+                self.archivo_historial.write(json.dumps(registro, ensure_ascii=False) + "\n")
+            self.archivo_historial.flush()
         except Exception as e:
-            logging.error(f"Error guardando historial JSON: {e}")
+            logging.error(f"Error guardando historial: {e}")
 
     async def _actualizar_ui(self):
         while self.running:
-            if os.path.exists(self.lock_file):
-                try:
-                    with open(self.lock_file, 'r') as f:
-                        if f.read().strip() == 'pause':
-                            await asyncio.sleep(1)
-                            continue
-                except:
-                    pass
-
-            # print("\033c", end="")  # Desactivado para mantener consola visible
-            self._mostrar_encabezado()
-            self._mostrar_estado_actual()
-            self._mostrar_historial()
+            await self.reanudado.wait()
 
-            await asyncio.sleep(1)
+            # Los contadores de tiempo cambian en cada frame mientras haya vuelos. Solo se
+            # muestran en pantalla completa: sin control de cursor obligarían a reimprimir
+            # el frame entero en cada refresco
+            if self.renderizador.ansi:
+                if self.vuelos_activos:
+                    self.renderizador.marcar_sucia("activos")
+                if self.vuelos_pendientes:
+                    self.renderizador.marcar_sucia("pendientes")
 
-    def _mostrar_encabezado(self):
-        print("=" * 80)
-        print(f"  SISTEMA DE CONTROL AÉREO - MONITOR DE VUELOS")
-        print(f"  Última actualización: {self.stats['ultima_actualizacion']}")
-        print("=" * 80)
-        print(f"\nESTADO DEL SISTEMA:")
-        print(f"  • Pistas disponibles: {self.stats['pistas_disponibles']}/{self.stats['pistas_totales']}")
-        print(f"  • Operaciones completadas: {self.stats['operaciones_completadas']}")
-        print(f"  • Tiempo de espera promedio: {self.stats['tiempo_espera_promedio']:.2f}s")
-        print("-" * 80)
-
-    def _mostrar_estado_actual(self):
-        print("\nOPERACIONES ACTIVAS:")
-        if self.vuelos_activos:
-            print(f"  {'ID VUELO':<10} {'OPERACIÓN':<12} {'PISTA':<6} {'TIEMPO':<8}")
-            print("  " + "-" * 40)
-            for id_vuelo, info in self.vuelos_activos.items():
-                tipo = info['tipo'].capitalize()
-                pista = info.get('pista', 'N/A')
-                tiempo_activo = time.perf_counter() - info.get('hora_inicio', time.perf_counter())
-                print(f"  {id_vuelo:<10} {tipo:<12} {pista:<6} {tiempo_activo:.2f}s")
-        else:
-            print("  No hay operaciones activas en este momento.")
-
-        print("\nSOLICITUDES PENDIENTES:")
-        if self.vuelos_pendientes:
-            print(f"  {'ID VUELO':<10} {'OPERACIÓN':<12} {'ESTADO':<15} {'ESPERA':<8}")
-            print("  " + "-" * 50)
-            for id_vuelo, info in self.vuelos_pendientes.items():
-                tipo = info['tipo'].capitalize()
-                estado = info.get('estado', 'desconocido')
-                tiempo_espera = time.perf_counter() - info.get('hora_solicitud', time.perf_counter())
-                print(f"  {id_vuelo:<10} {tipo:<12} {estado:<15} {tiempo_espera:.2f}s")
-        else:
-            print("  No hay solicitudes pendientes en este momento.")
+            self._ajustar_filas_visibles()
+            self._generar_encabezado()
+            self._generar_estado_actual()
+            self._generar_historial()
+            self.renderizador.pintar()
+
+            # Un cambio de intervalo por el canal de control despierta el bucle antes de tiempo
+            try:
+                await asyncio.wait_for(self.despertar_ui.wait(), self.intervalo_refresco)
+            except asyncio.TimeoutError:
+                pass
+            self.despertar_ui.clear()
+
+    def _ajustar_filas_visibles(self):
+        """Reparte entre las tres tablas las filas que caben en el terminal"""
+        if not self.renderizador.ansi:
+            return
+        _, alto = self.renderizador.tamano_terminal()
+        filas = max(1, min(MAX_FILAS_VISIBLES, (alto - LINEAS_FIJAS_UI) // 3))
+        if filas != self.filas_visibles:
+            self.filas_visibles = filas
+            self.renderizador.marcar_sucia()
+
+    def _generar_encabezado(self):
+        if not self.renderizador.seccion_sucia("encabezado"):
+            return
+        self.renderizador.actualizar_seccion("encabezado", [
+            "=" * 80,
+            f"  SISTEMA DE CONTROL AÉREO - MONITOR DE VUELOS",
+            f"  Última actualización: {self.stats['ultima_actualizacion']}",
+            "=" * 80,
+            "",
+            f"ESTADO DEL SISTEMA:",
+            f"  • Pistas disponibles: {self.stats['pistas_disponibles']}/{self.stats['pistas_totales']}",
+            f"  • Operaciones completadas: {self.stats['operaciones_completadas']}",
+            f"  • Tiempo de espera promedio: {self.stats['tiempo_espera_promedio']:.2f}s",
+            f"  • Capacidad (ops/hora): {self.stats['capacidad_lograda_ops_hora']:.0f} lograda / "
+            f"{self.stats['capacidad_teorica_ops_hora']:.0f} teórica",
+            "-" * 80,
+        ])
+
+    def _generar_estado_actual(self):
+        ahora = time.perf_counter()
+        en_vivo = self.renderizador.ansi
 
-    def _mostrar_historial(self):
-        print("\nOPERACIONES RECIENTES:")
+        if self.renderizador.seccion_sucia("activos"):
+            lineas = ["", f"OPERACIONES ACTIVAS ({len(self.vuelos_activos)}):"]
+            if self.vuelos_activos:
+                lineas.append(f"  {'ID VUELO':<10} {'OPERACIÓN':<12} {'PISTA':<6} {'TIEMPO' if en_vivo else '':<8}")
+                lineas.append("  " + "-" * 40)
+                for id_vuelo, info in islice(self.vuelos_activos.items(), self.filas_visibles):
+                    tipo = info['tipo'].capitalize()
+                    pista = info.get('pista', 'N/A')
+                    linea = f"  {id_vuelo:<10} {tipo:<12} {pista:<6}"
+                    if en_vivo:
+                        linea += f" {ahora - info.get('hora_inicio', ahora):.2f}s"
+                    lineas.append(linea)
+                ocultas = len(self.vuelos_activos) - self.filas_visibles
+                if ocultas > 0:
+                    lineas.append(f"  ... y {ocultas} operaciones activas más")
+            else:
+                lineas.append("  No hay operaciones activas en este momento.")
+            self.renderizador.actualizar_seccion("activos", lineas)
+
+        if self.renderizador.seccion_sucia("pendientes"):
+            lineas = ["", f"SOLICITUDES PENDIENTES ({len(self.vuelos_pendientes)}):"]
+            if self.vuelos_pendientes:
+                lineas.append(f"  {'ID VUELO':<10} {'OPERACIÓN':<12} {'ESTADO':<15} {'ESPERA' if en_vivo else '':<8}")
+                lineas.append("  " + "-" * 50)
+                # Los diccionarios conservan el orden de llegada: mostramos los que más esperan
+                for id_vuelo, info in islice(self.vuelos_pendientes.items(), self.filas_visibles):
+                    tipo = info['tipo'].capitalize()
+                    estado = info.get('estado', 'desconocido')
+                    linea = f"  {id_vuelo:<10} {tipo:<12} {estado:<15}"
+                    if en_vivo:
+                        linea += f" {ahora - info.get('hora_solicitud', ahora):.2f}s"
+                    lineas.append(linea)
+                ocultas = len(self.vuelos_pendientes) - self.filas_visibles
+                if ocultas > 0:
+                    lineas.append(
+                        f"  ... y {ocultas} solicitudes más "
+                        f"(total aterrizajes: {self.resumen_pendientes['aterrizaje']}, "
+                        f"despegues: {self.resumen_pendientes['despegue']})"
+                    )
+            else:
+                lineas.append("  No hay solicitudes pendientes en este momento.")
+            self.renderizador.actualizar_seccion("pendientes", lineas)
+
+    def _generar_historial(self):
+        if not self.renderizador.seccion_sucia("historial"):
+            return
+        lineas = ["", "OPERACIONES RECIENTES:"]
         if self.historial:
-            print(f"  {'ID VUELO':<10} {'OPERACIÓN':<12} {'PISTA':<6} {'DURACIÓN':<9} {'ESPERA':<8} {'HORA':<8}")
-            print("  " + "-" * 60)
-            for op in list(self.historial)[-10:]:
-                print(f"  {op['id']:<10} {op['tipo']:<12} {op['pista']:<6} "
-                      f"{op['duracion']:<9.2f}s {op['espera']:<8.2f}s {op['hora']}")
+            lineas.append(f"  {'ID VUELO':<10} {'OPERACIÓN':<12} {'PISTA':<6} {'DURACIÓN':<9} {'ESPERA':<8} {'HORA':<8}")
+            lineas.append("  " + "-" * 60)
+            # Recorremos solo las últimas filas en lugar de copiar todo el deque
+            recientes = list(islice(reversed(self.historial), self.filas_visibles))
+            for op in reversed(recientes):
+                lineas.append(f"  {op['id']:<10} {op['tipo']:<12} {op['pista']:<6} "
+                              f"{op['duracion']:<9.2f}s {op['espera']:<8.2f}s {op['hora']}")
         else:
-            print("  No hay operaciones completadas aún.")
+            lineas.append("  No hay operaciones completadas aún.")
+        self.renderizador.actualizar_seccion("historial", lineas)
 
 async def main():
-    monitor = MonitorVuelos()
+    # Uso: python monitor.py [intervalo] [--pantalla-completa]
+    argumentos = sys.argv[1:]
+    pantalla_completa = "--pantalla-completa" in argumentos
+    if pantalla_completa:
+        argumentos.remove("--pantalla-completa")
+        # Los mensajes de log desplazarían la pantalla bajo el pintado por diferencias
+        logging.basicConfig(
+            filename=LOG_PANTALLA_COMPLETA,
+            level=logging.getLogger().level,
+            format='%(asctime)s - [Monitor] %(message)s',
+            datefmt='%H:%M:%S',
+            force=True
+        )
 
-    if os.path.exists(monitor.lock_file):
+    # Intervalo de refresco opcional como primer argumento (en segundos)
+    intervalo = REFRESCO_UI
+    if argumentos:
         try:
-            os.remove(monitor.lock_file)
-        except:
-            pass
+            intervalo = max(REFRESCO_MINIMO, float(argumentos[0]))
+        except ValueError:
+            logging.warning(f"Intervalo de refresco no válido: {argumentos[0]}")
+
+    monitor = MonitorVuelos(intervalo, pantalla_completa)
 
     try:
-        await monitor.iniciar_servidor()
+        await monitor.iniciar()
     except KeyboardInterrupt:
         monitor.running = False
         logging.info("Monitor detenido por el usuario")
-
-    if os.path.exists(monitor.lock_file):
-        try:
-            os.remove(monitor.lock_file)
-        except:
-            pass
+    finally:
+        monitor.renderizador.terminar()
+        if monitor.archivo_historial is not None:
+            monitor.archivo_historial.close()
 
 if __name__ == "__main__":
     try:
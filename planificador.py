@@ -0,0 +1,302 @@
+"""
+planificador.py - Asignación de pistas y secuenciación de operaciones de la torre
+"""
+
+import asyncio
+import random
+import time
+from collections import Counter, namedtuple
+
+OPERACIONES = ("aterrizaje", "despegue")
+CLASES = ("ligero", "medio", "pesado")
+
+# Operaciones que admite cada tipo de pista
+CAPACIDADES = {
+    "mixta": ("aterrizaje", "despegue"),
+    "aterrizaje": ("aterrizaje",),
+    "despegue": ("despegue",),
+}
+
+# Tiempo de servicio (segundos) por operación y clase de avión: (distribución, parámetros...)
+# Distribuciones: ("fija", valor), ("uniforme", min, max), ("normal", media, desv), ("exponencial", media)
+TIEMPOS_SERVICIO = {
+    ("aterrizaje", "ligero"): ("normal", 2.5, 0.3),
+    ("aterrizaje", "medio"): ("normal", 3.0, 0.3),
+    ("aterrizaje", "pesado"): ("normal", 3.5, 0.4),
+    ("despegue", "ligero"): ("normal", 2.0, 0.2),
+    ("despegue", "medio"): ("normal", 2.5, 0.3),
+    ("despegue", "pesado"): ("normal", 3.0, 0.3),
+}
+
+# Separación mínima (segundos) entre operaciones consecutivas en la misma pista.
+# Se suma la separación por tipo de operación y la de estela turbulenta por clase.
+SEPARACION_OPERACION = {
+    ("aterrizaje", "aterrizaje"): 0.5,
+    ("aterrizaje", "despegue"): 0.3,
+    ("despegue", "aterrizaje"): 0.8,
+    ("despegue", "despegue"): 0.5,
+}
+SEPARACION_ESTELA = {
+    ("pesado", "ligero"): 1.0,
+    ("pesado", "medio"): 0.6,
+    ("medio", "ligero"): 0.4,
+}
+
+VENTANA_SECUENCIACION = 20  # Solicitudes más antiguas entre las que se elige la siguiente
+MAX_ESPERA_REORDENACION = 30  # Segundos tras los que una solicitud ya no puede ser adelantada
+
+Asignacion = namedtuple("Asignacion", ["pista", "separacion", "servicio"])
+
+
+def muestrear(distribucion):
+    """Genera un tiempo de servicio a partir de una distribución"""
+    tipo, *parametros = distribucion
+    if tipo == "fija":
+        return parametros[0]
+    if tipo == "uniforme":
+        return random.uniform(*parametros)
+    if tipo == "normal":
+        media, desviacion = parametros
+        # Truncamos para no generar tiempos negativos o absurdamente cortos
+        return max(0.1 * media, random.gauss(media, desviacion))
+    if tipo == "exponencial":
+        return random.expovariate(1 / parametros[0])
+    raise ValueError(f"Distribución desconocida: {tipo}")
+
+
+def media(distribucion):
+    """Valor esperado de una distribución de tiempos de servicio"""
+    tipo, *parametros = distribucion
+    if tipo in ("fija", "normal", "exponencial"):
+        return parametros[0]
+    if tipo == "uniforme":
+        return sum(parametros) / 2
+    raise ValueError(f"Distribución desconocida: {tipo}")
+
+
+def varianza(distribucion):
+    """Varianza de una distribución de tiempos de servicio (la normal se considera sin truncar)"""
+    tipo, *parametros = distribucion
+    if tipo == "fija":
+        return 0.0
+    if tipo == "uniforme":
+        return (parametros[1] - parametros[0]) ** 2 / 12
+    if tipo == "normal":
+        return parametros[1] ** 2
+    if tipo == "exponencial":
+        return parametros[0] ** 2
+    raise ValueError(f"Distribución desconocida: {tipo}")
+
+
+def separacion(anterior, siguiente):
+    """Separación necesaria entre dos operaciones (operacion, clase) consecutivas en una pista"""
+    if anterior is None:
+        return 0.0
+    return (
+        SEPARACION_OPERACION.get((anterior[0], siguiente[0]), 0.0)
+        + SEPARACION_ESTELA.get((anterior[1], siguiente[1]), 0.0)
+    )
+
+
+class Pista:
+    """Estado de una pista para el planificador"""
+
+    def __init__(self, id_pista, capacidad):
+        if capacidad not in CAPACIDADES:
+            raise ValueError(f"Capacidad de pista desconocida: {capacidad}")
+        self.id = id_pista
+        self.capacidad = capacidad
+        self.operaciones = CAPACIDADES[capacidad]
+        self.ocupada = False
+        self.ultima = None  # (operacion, clase) de la última operación realizada
+        self.fin_ultima = None  # Momento (perf_counter) en que terminó la última operación
+        self.tiempo_ocupada = 0.0
+        self.operaciones_realizadas = 0
+
+
+class Solicitud:
+    """Vuelo esperando pista"""
+
+    def __init__(self, id_vuelo, operacion, clase, futuro):
+        self.id = id_vuelo
+        self.operacion = operacion
+        self.clase = clase
+        self.llegada = time.perf_counter()
+        self.futuro = futuro
+
+
+class Planificador:
+    """Elige pista y orden de las operaciones para maximizar las operaciones por hora"""
+
+    def __init__(self, pistas, tiempos_servicio=None):
+        """
+        Inicializa el planificador
+
+        Args:
+            pistas: Diccionario id de pista -> capacidad ('mixta', 'aterrizaje' o 'despegue')
+            tiempos_servicio: Distribuciones por (operacion, clase); por defecto TIEMPOS_SERVICIO
+        """
+        self.pistas = {id_pista: Pista(id_pista, capacidad) for id_pista, capacidad in pistas.items()}
+        self.tiempos_servicio = tiempos_servicio or TIEMPOS_SERVICIO
+        self.cola = {}  # ID -> Solicitud, en orden de llegada
+
+        # Mezcla de tráfico observada, para estimar la capacidad teórica
+        self.mezcla = Counter()
+        self.operaciones_completadas = 0
+        self.inicio = time.perf_counter()
+
+        # Tiempo con al menos un vuelo en el sistema, para medir la capacidad lograda
+        self.en_sistema = 0
+        self.inicio_demanda = None
+        self.tiempo_con_demanda = 0.0
+
+    def admite(self, operacion):
+        return any(operacion in pista.operaciones for pista in self.pistas.values())
+
+    def pistas_ocupadas(self):
+        return sum(1 for pista in self.pistas.values() if pista.ocupada)
+
+    def solicitar(self, id_vuelo, operacion, clase):
+        """Encola una solicitud y devuelve un futuro que se resuelve con su Asignacion"""
+        futuro = asyncio.get_running_loop().create_future()
+        self.cola[id_vuelo] = Solicitud(id_vuelo, operacion, clase, futuro)
+        self.mezcla[(operacion, clase)] += 1
+        self._actualizar_demanda(1)
+        self._despachar()
+        return futuro
+
+    def cancelar(self, id_vuelo):
+        """Retira una solicitud que aún espera pista. Devuelve False si ya tenía pista asignada"""
+        solicitud = self.cola.pop(id_vuelo, None)
+        if solicitud is None:
+            return False
+        if not solicitud.futuro.done():
+            solicitud.futuro.cancel()
+        self._actualizar_demanda(-1)
+        return True
+
+    def liberar(self, id_pista, tiempo_ocupada, completada=True):
+        """Marca una pista como libre tras una operación (completada o interrumpida) y asigna la siguiente"""
+        pista = self.pistas[id_pista]
+        pista.ocupada = False
+        pista.fin_ultima = time.perf_counter()
+        pista.tiempo_ocupada += tiempo_ocupada
+        if completada:
+            pista.operaciones_realizadas += 1
+            self.operaciones_completadas += 1
+        self._actualizar_demanda(-1)
+        self._despachar()
+
+    def _actualizar_demanda(self, delta):
+        ahora = time.perf_counter()
+        if self.en_sistema == 0 and delta > 0:
+            self.inicio_demanda = ahora
+        self.en_sistema += delta
+        if self.en_sistema == 0 and self.inicio_demanda is not None:
+            self.tiempo_con_demanda += ahora - self.inicio_demanda
+            self.inicio_demanda = None
+
+    def _despachar(self):
+        while True:
+            eleccion = self._elegir()
+            if eleccion is None:
+                return
+            pista, solicitud, espera_separacion = eleccion
+
+            del self.cola[solicitud.id]
+            pista.ocupada = True
+            pista.ultima = (solicitud.operacion, solicitud.clase)
+            servicio = muestrear(self.tiempos_servicio[pista.ultima])
+            solicitud.futuro.set_result(Asignacion(pista.id, espera_separacion, servicio))
+
+    def _elegir(self):
+        """
+        Elige el par (pista libre, solicitud) con menos separación pendiente, que es el tiempo
+        de pista perdido; a igual separación, la solicitud más antigua. El tiempo de servicio
+        no depende del orden, así que solo sirve para elegir entre pistas libres (y, a igualdad,
+        se prefiere la pista especializada para dejar libres las mixtas). Solo se consideran las solicitudes más antiguas, y la más antigua no puede ser
+        adelantada si ya ha esperado MAX_ESPERA_REORDENACION segundos. Esa prioridad solo
+        bloquea las pistas que pueden atenderla: el resto sigue atendiendo a las demás.
+        """
+        libres = [pista for pista in self.pistas.values() if not pista.ocupada]
+        if not libres or not self.cola:
+            return None
+
+        candidatas = []
+        for solicitud in self.cola.values():
+            if len(candidatas) >= VENTANA_SECUENCIACION:
+                break
+            candidatas.append(solicitud)
+
+        ahora = time.perf_counter()
+        antigua = candidatas[0]
+        sin_adelantos = ahora - antigua.llegada > MAX_ESPERA_REORDENACION
+
+        mejor = None
+        for pista in libres:
+            if sin_adelantos and antigua.operacion in pista.operaciones:
+                opciones = candidatas[:1]
+            else:
+                opciones = candidatas
+            for orden, solicitud in enumerate(opciones):
+                if solicitud.operacion not in pista.operaciones:
+                    continue
+                siguiente = (solicitud.operacion, solicitud.clase)
+                espera = self._separacion_pendiente(pista, siguiente, ahora)
+                coste = (espera, orden, media(self.tiempos_servicio[siguiente]), len(pista.operaciones))
+                if mejor is None or coste < mejor[0]:
+                    mejor = (coste, pista, solicitud, espera)
+
+        if mejor is None:
+            return None
+        return mejor[1], mejor[2], mejor[3]
+
+    def _separacion_pendiente(self, pista, siguiente, ahora):
+        """Separación que aún falta por cumplir: el tiempo que la pista lleva libre ya cuenta"""
+        necesaria = separacion(pista.ultima, siguiente)
+        if pista.fin_ultima is None:
+            return necesaria
+        return max(0.0, necesaria - (ahora - pista.fin_ultima))
+
+    def informe_capacidad(self):
+        """Capacidad lograda frente a la teórica (operaciones por hora) y utilización por pista"""
+        ahora = time.perf_counter()
+        tiempo_con_demanda = self.tiempo_con_demanda
+        if self.inicio_demanda is not None:
+            tiempo_con_demanda += ahora - self.inicio_demanda
+        transcurrido = ahora - self.inicio
+
+        lograda = (
+            self.operaciones_completadas * 3600 / tiempo_con_demanda
+            if tiempo_con_demanda > 0 else 0
+        )
+        teorica = sum(self._capacidad_teorica_pista(pista) for pista in self.pistas.values())
+
+        return {
+            "capacidad_teorica_ops_hora": round(teorica, 1),
+            "capacidad_lograda_ops_hora": round(lograda, 1),
+            "eficiencia": round(lograda / teorica, 3) if teorica > 0 else 0,
+            "utilizacion_pistas": {
+                str(pista.id): round(pista.tiempo_ocupada / transcurrido, 3) if transcurrido > 0 else 0
+                for pista in self.pistas.values()
+            }
+        }
+
+    def _capacidad_teorica_pista(self, pista):
+        """
+        Cota superior de operaciones por hora de una pista con la mezcla observada,
+        suponiendo que cada operación va precedida de la que exige menor separación.
+        Es el límite al que se acerca _elegir, que minimiza la separación pendiente,
+        cuando la cola es larga y hay donde elegir dentro de la ventana
+        """
+        mezcla = {tipo: n for tipo, n in self.mezcla.items() if tipo[0] in pista.operaciones}
+        if not mezcla:
+            # Sin tráfico aún: suponemos una mezcla uniforme de lo que admite la pista
+            mezcla = {(op, clase): 1 for op in pista.operaciones for clase in CLASES}
+
+        total = sum(mezcla.values())
+        ciclo = 0.0
+        for tipo, n in mezcla.items():
+            separacion_minima = min(separacion(anterior, tipo) for anterior in mezcla)
+            ciclo += n / total * (media(self.tiempos_servicio[tipo]) + separacion_minima)
+        return 3600 / ciclo if ciclo > 0 else 0
@@ -0,0 +1,143 @@
+"""
+renderizador.py - Pintado incremental de la interfaz del monitor en terminal
+"""
+
+import shutil
+import sys
+
+# Secuencias ANSI de control del cursor
+LIMPIAR_PANTALLA = "\033[2J\033[H"
+BORRAR_LINEA = "\033[K"
+BORRAR_LINEA_COMPLETA = "\033[2K"
+ENTRAR_PANTALLA_ALTERNATIVA = "\033[?1049h\033[?25l"
+SALIR_PANTALLA_ALTERNATIVA = "\033[?25h\033[?1049l"
+
+REPINTADO_COMPLETO = 30  # Frames entre repintados completos, por si algo ha desplazado la pantalla
+
+
+def mover_cursor(fila):
+    """Devuelve la secuencia ANSI que sitúa el cursor al inicio de una fila (base 0)"""
+    return f"\033[{fila + 1};1H"
+
+
+class RenderizadorTerminal:
+    """Compone la pantalla por secciones y solo redibuja las líneas que cambian"""
+
+    def __init__(self, secciones, salida=None, ansi=False):
+        """
+        Inicializa el renderizador
+
+        Args:
+            secciones: Nombres de las secciones en el orden en que se pintan
+            salida: Flujo de salida (por defecto sys.stdout)
+            ansi: Usar control de cursor en la pantalla alternativa. Solo tiene sentido si el
+                proceso tiene el terminal para él solo; se ignora si la salida no es un terminal
+        """
+        self.salida = salida or sys.stdout
+        self.ansi = ansi and hasattr(self.salida, "isatty") and self.salida.isatty()
+
+        self.orden = list(secciones)
+        self.secciones = {nombre: [] for nombre in self.orden}
+        self.sucias = set(self.orden)
+
+        # Líneas que hay actualmente en pantalla (último frame pintado)
+        self.pantalla = []
+        self.pantalla_valida = False
+        self.tamano = None
+        self.frames_desde_repintado = 0
+
+    def tamano_terminal(self):
+        """(columnas, filas) del terminal"""
+        return tuple(shutil.get_terminal_size())
+
+    def iniciar(self):
+        """Pasa a la pantalla alternativa para no borrar lo que ya hay en la consola"""
+        if self.ansi:
+            self.salida.write(ENTRAR_PANTALLA_ALTERNATIVA)
+            self.salida.flush()
+            self.invalidar()
+
+    def terminar(self):
+        """Vuelve a la pantalla normal del terminal"""
+        if self.ansi:
+            self.salida.write(SALIR_PANTALLA_ALTERNATIVA)
+            self.salida.flush()
+
+    def seccion_sucia(self, nombre):
+        """Indica si una sección debe volver a generarse"""
+        return nombre in self.sucias
+
+    def marcar_sucia(self, *nombres):
+        """Marca una o varias secciones como pendientes de regenerar"""
+        self.sucias.update(nombres or self.orden)
+
+    def actualizar_seccion(self, nombre, lineas):
+        """Sustituye el contenido de una sección y la da por regenerada"""
+        self.secciones[nombre] = lineas
+        self.sucias.discard(nombre)
+
+    def invalidar(self):
+        """Fuerza un repintado completo en el próximo frame (p.ej. tras una pausa)"""
+        self.pantalla = []
+        self.pantalla_valida = False
+
+    def pintar(self):
+        """Escribe en la salida solo las diferencias con el frame anterior"""
+        frame = []
+        for nombre in self.orden:
+            frame.extend(self.secciones[nombre])
+
+        if self.ansi:
+            frame = self._ajustar_a_terminal(frame)
+            partes = self._diferencias_ansi(frame)
+        elif frame != self.pantalla:
+            # Sin control de cursor solo podemos reimprimir, pero nunca un frame idéntico
+            partes = ["\n".join(frame), "\n"]
+        else:
+            partes = []
+
+        self.pantalla = frame
+        self.pantalla_valida = True
+
+        if partes:
+            self.salida.write("".join(partes))
+            self.salida.flush()
+        return len(partes)
+
+    def _ajustar_a_terminal(self, frame):
+        """Recorta el frame al tamaño del terminal para que las filas absolutas no se salgan"""
+        tamano = self.tamano_terminal()
+        self.frames_desde_repintado += 1
+        if tamano != self.tamano or self.frames_desde_repintado >= REPINTADO_COMPLETO:
+            self.tamano = tamano
+            self.invalidar()
+
+        columnas, filas = tamano
+        # Una línea más ancha que el terminal ocuparía dos filas
+        frame = [linea[:columnas - 1] for linea in frame]
+        # La última fila queda libre para el cursor, así nunca se desplaza la pantalla
+        if len(frame) > filas - 1:
+            ocultas = len(frame) - (filas - 2)
+            frame = frame[:max(0, filas - 2)] + [f"  ... {ocultas} líneas más (amplíe la terminal)"[:columnas - 1]]
+        return frame
+
+    def _diferencias_ansi(self, frame):
+        partes = []
+        anterior = self.pantalla
+        if not self.pantalla_valida:
+            partes.append(LIMPIAR_PANTALLA)
+            anterior = []
+            self.frames_desde_repintado = 0
+
+        for fila, linea in enumerate(frame):
+            if fila >= len(anterior) or anterior[fila] != linea:
+                partes.append(f"{mover_cursor(fila)}{linea}{BORRAR_LINEA}")
+
+        # Si el frame es más corto que el anterior, borramos las líneas sobrantes
+        for fila in range(len(frame), len(anterior)):
+            partes.append(f"{mover_cursor(fila)}{BORRAR_LINEA_COMPLETA}")
+
+        if partes:
+            # Dejamos el cursor debajo de la interfaz (como mucho en la última fila libre)
+            partes.append(mover_cursor(len(frame)))
+        return partes
@@ -1,31 +1,144 @@
 import asyncio
 import json
-import socket
 import time
+from collections import deque
 from datetime import datetime
 
+from control import ServidorControl, empaquetar, leer_mensaje
+from planificador import CLASES, OPERACIONES, Planificador
+
 HOST = '127.0.0.1'
 PORT = 5000
-MONITOR_PORT = 5001
-MAX_PISTAS = 2
+PUBSUB_PORT = 5002
+CONTROL_PORT = 5003
+# Pistas del aeropuerto y operaciones que admite cada una ('mixta', 'aterrizaje' o 'despegue')
+PISTAS = {1: "mixta", 2: "mixta"}
+MAX_PISTAS = len(PISTAS)
+INTERVALO_PUBLICACION = 1.0  # Segundos entre actualizaciones a los suscriptores
+MUESTRAS_ESTADISTICAS = 1000  # Últimas operaciones usadas para percentiles y tiempos de servicio
+
+# Temas a los que puede suscribirse un monitor, grabador o consumidor de alertas
+TEMAS = ("estado", "completados", "estadisticas")
+# De estos temas solo interesa la última versión: si el suscriptor va lento se sustituye
+TEMAS_COALESCIBLES = ("estado", "estadisticas")
+MAX_BUFFER_SUSCRIPTOR = 64  # Mensajes encolados antes de desconectar a un suscriptor lento
+
+
+def empaquetar_mensaje(tema, datos):
+    """Serializa un mensaje con el prefijo de longitud de 4 bytes que usa el protocolo"""
+    return empaquetar({
+        "tema": tema,
+        "timestamp": datetime.now().strftime("%H:%M:%S"),
+        "datos": datos
+    })
+
+
+def percentil(valores_ordenados, p):
+    """Percentil p (0-100) por rango más cercano de una lista ya ordenada"""
+    if not valores_ordenados:
+        return 0
+    indice = max(0, min(len(valores_ordenados) - 1, round(p / 100 * len(valores_ordenados)) - 1))
+    return valores_ordenados[indice]
+
+
+class Suscriptor:
+    """Conexión de un suscriptor con su propio buffer de salida"""
+
+    def __init__(self, writer, temas):
+        self.writer = writer
+        self.temas = set(temas)
+        self.cola = deque()
+        self.hay_datos = asyncio.Event()
+        self.activo = True
+
+    def encolar(self, tema, mensaje):
+        """Añade un mensaje ya serializado al buffer. Devuelve False si el suscriptor no da abasto"""
+        if tema in TEMAS_COALESCIBLES:
+            for i, (tema_encolado, _) in enumerate(self.cola):
+                if tema_encolado == tema:
+                    self.cola[i] = (tema, mensaje)
+                    return True
+        elif len(self.cola) >= MAX_BUFFER_SUSCRIPTOR:
+            return False
+
+        self.cola.append((tema, mensaje))
+        self.hay_datos.set()
+        return True
+
+    async def enviar_pendientes(self):
+        """Vacía el buffer hacia el socket; un suscriptor lento solo se bloquea a sí mismo"""
+        while self.activo:
+            await self.hay_datos.wait()
+            self.hay_datos.clear()
+            while self.cola and self.activo:
+                _, mensaje = self.cola.popleft()
+                self.writer.write(mensaje)
+                await self.writer.drain()
+
+    def cerrar(self, abortar=False):
+        """
+        Cierra la conexión. Con abortar=True se descarta lo que haya en el socket: close()
+        no despierta un drain() bloqueado por un par que ha dejado de leer
+        """
+        self.activo = False
+        self.cola.clear()
+        self.hay_datos.set()
+        if abortar:
+            self.writer.transport.abort()
+        else:
+            self.writer.close()
+
 
 class TorreControl:
     def __init__(self):
         self.vuelos_pendientes = {}    # ID -> info
         self.vuelos_activos = {}       # ID -> info
         self.vuelos_completados = {}   # ID -> info
+        self.completados_publicados = 0  # Secuencia del último completado entregado a los suscriptores
 
-        self.pistas_ocupadas = 0
+        self.planificador = Planificador(PISTAS)
         self.operaciones_completadas = 0
         self.tiempo_espera_total = 0
 
+        # Medidas para contrastar con el modelo analítico de capacidad.py
+        self.solicitudes_recibidas = 0
+        self.primera_solicitud = None
+        self.esperas = deque(maxlen=MUESTRAS_ESTADISTICAS)  # Hasta la asignación de pista
+        self.ocupaciones = deque(maxlen=MUESTRAS_ESTADISTICAS)
+
+        # Vuelos cuyo avión se fue o cuyo plazo venció (capacidad recuperada o desperdiciada)
+        self.vuelos_cancelados = 0
+        self.plazos_vencidos = 0
+        self.operaciones_interrumpidas = 0
+        self.tiempo_pista_desperdiciado = 0.0
+
+        self.suscriptores = set()
+        self.intervalo_publicacion = INTERVALO_PUBLICACION
+        self.publicacion_activa = asyncio.Event()
+        self.publicacion_activa.set()
+
+        self.control = ServidorControl("torre", CONTROL_PORT)
+        self.control.registrar("pausar", self._cmd_pausar)
+        self.control.registrar("reanudar", self._cmd_reanudar)
+        self.control.registrar("estadisticas", self._cmd_estadisticas)
+        self.control.registrar("intervalo", self._cmd_intervalo)
+
     async def iniciar(self):
-        asyncio.create_task(self.enviar_actualizaciones_monitor())
+        asyncio.create_task(self.publicar_actualizaciones())
 
         server = await asyncio.start_server(self.manejar_conexion, HOST, PORT)
+        servidor_pubsub = await asyncio.start_server(self.manejar_suscripcion, HOST, PUBSUB_PORT)
         print(f"[TORRE] Torre de control escuchando en {HOST}:{PORT}")
-        async with server:
-            await server.serve_forever()
+        print(f"[TORRE] Publicando actualizaciones en {HOST}:{PUBSUB_PORT}")
+
+        # El canal de control se abre el último: si responde al ping, la torre está lista
+        servidor_control = await self.control.iniciar()
+        async with server, servidor_pubsub, servidor_control:
+            await asyncio.gather(
+                server.serve_forever(),
+                servidor_pubsub.serve_forever(),
+                servidor_control.serve_forever()
+            )
 
     async def manejar_conexion(self, reader, writer):
         datos = await reader.read(1024)
@@ -36,20 +149,38 @@ class TorreControl:
             
             id_vuelo = solicitud.get('id')
             operacion = solicitud.get('tipo')
+            clase = solicitud.get('clase', 'medio')
+            if clase not in CLASES:
+                clase = 'medio'
+            # Plazo (segundos) que el avión está dispuesto a esperar por una pista
+            plazo = solicitud.get('plazo')
+            # bool es subclase de int: un true/false en el JSON no es un plazo válido
+            if isinstance(plazo, bool) or not isinstance(plazo, (int, float)) or plazo <= 0:
+                plazo = None
             
-            if not id_vuelo or operacion not in ['aterrizaje', 'despegue']:
+            if not id_vuelo or operacion not in OPERACIONES:
                 print(f"[TORRE] Solicitud inválida: {solicitud}")
-                writer.write(json.dumps({
+                await self._responder(writer, {
                     'status': 'rechazado',
                     'mensaje': 'Formato de solicitud inválido'
-                }).encode())
-                await writer.drain()
-                writer.close()
+                })
+                return
+
+            if not self.planificador.admite(operacion):
+                motivo = f'Ninguna pista admite {operacion}'
+            elif id_vuelo in self.vuelos_pendientes or id_vuelo in self.vuelos_activos:
+                motivo = f'El vuelo {id_vuelo} ya tiene una operación en curso'
+            else:
+                motivo = None
+            if motivo:
+                print(f"[TORRE] Solicitud rechazada: {motivo}")
+                await self._responder(writer, {'status': 'rechazado', 'mensaje': motivo})
                 return
                 
             # Creamos la información del vuelo
             vuelo_info = {
                 "tipo": operacion,
+                "clase": clase,
                 "estado": "pendiente",
                 "hora_solicitud": time.perf_counter(),
                 "aerolinea": solicitud.get('aerolinea', 'N/A')
@@ -57,131 +188,329 @@ class TorreControl:
 
             # Registramos la solicitud como pendiente
             self.vuelos_pendientes[id_vuelo] = vuelo_info
-            print(f"[TORRE] Solicitud recibida: {id_vuelo} quiere {operacion}")
-            
-            # Si hay pistas disponibles, autorizamos inmediatamente
-            if self.pistas_ocupadas < MAX_PISTAS:
-                pista_asignada = self._asignar_pista()
-                
-                # Respondemos al avión con la autorización
-                respuesta = {
-                    'status': 'autorizado',
-                    'pista': pista_asignada,
-                    'mensaje': f'{operacion.capitalize()} autorizado en pista {pista_asignada}'
-                }
-                writer.write(json.dumps(respuesta).encode())
-                await writer.drain()
-                
-                # Procesamos el vuelo
-                asyncio.create_task(self.procesar_vuelo(id_vuelo))
+            self.solicitudes_recibidas += 1
+            if self.primera_solicitud is None:
+                self.primera_solicitud = vuelo_info["hora_solicitud"]
+            print(f"[TORRE] Solicitud recibida: {id_vuelo} ({clase}) quiere {operacion}")
+
+            # El planificador asigna pista al momento si hay una libre que admita la operación
+            asignacion = self.planificador.solicitar(id_vuelo, operacion, clase)
+            autorizado = asignacion.done()
+            if autorizado:
+                await self._responder(writer, self._autorizacion(operacion, asignacion.result()))
             else:
                 # Si no hay pistas, ponemos en espera
-                respuesta = {
+                await self._responder(writer, {
                     'status': 'en_espera',
                     'mensaje': 'Todas las pistas están ocupadas, en espera de autorización'
-                }
-                writer.write(json.dumps(respuesta).encode())
-                await writer.drain()
-                
-                # Programamos el procesamiento para cuando haya una pista libre
-                asyncio.create_task(self.procesar_vuelo(id_vuelo))
+                })
+            
+            # La sesión sigue abierta hasta que la operación termina o el avión se desconecta
+            await self._seguir_sesion(id_vuelo, asignacion, plazo, not autorizado, reader, writer)
         
+        except asyncio.CancelledError:
+            # La torre se está deteniendo con la sesión del avión abierta
+            pass
         except json.JSONDecodeError:
             print("[TORRE] Error decodificando JSON:", datos.decode())
-            writer.write(json.dumps({
+            await self._responder(writer, {
                 'status': 'error',
                 'mensaje': 'Formato de mensaje inválido'
-            }).encode())
-            await writer.drain()
+            })
         except Exception as e:
             print(f"[TORRE] Error procesando solicitud: {e}")
-            writer.write(json.dumps({
+            await self._responder(writer, {
                 'status': 'error',
                 'mensaje': f'Error en la torre: {str(e)}'
-            }).encode())
-            await writer.drain()
+            })
         finally:
             writer.close()
-            await writer.wait_closed()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
 
-    async def procesar_vuelo(self, id_vuelo):
-        # Esperamos a que se libere una pista si todas están ocupadas
-        while self.pistas_ocupadas >= MAX_PISTAS:
-            await asyncio.sleep(0.5)
+    async def _responder(self, writer, mensaje):
+        """Envía un mensaje JSON (uno por línea) al avión; si se ha ido, lo detecta la sesión"""
+        try:
+            writer.write(json.dumps(mensaje).encode() + b"\n")
+            await writer.drain()
+        except ConnectionError:
+            pass
 
-        # Movemos el vuelo de pendiente a activo
-        vuelo = self.vuelos_pendientes.pop(id_vuelo, None)
-        if not vuelo:
-            print(f"[TORRE] Error: El vuelo {id_vuelo} ya no está pendiente")
-            return
-            
-        vuelo["estado"] = "activo"
-        vuelo["hora_inicio"] = time.perf_counter()
-        vuelo["pista"] = self._asignar_pista()
-        self.vuelos_activos[id_vuelo] = vuelo
-        self.pistas_ocupadas += 1
+    def _autorizacion(self, operacion, asignacion):
+        return {
+            'status': 'autorizado',
+            'pista': asignacion.pista,
+            'tiempo_operacion': round(asignacion.separacion + asignacion.servicio, 2),
+            'mensaje': f'{operacion.capitalize()} autorizado en pista {asignacion.pista}'
+        }
+
+    async def _seguir_sesion(self, id_vuelo, asignacion, plazo, avisar_autorizacion, reader, writer):
+        operacion = asyncio.create_task(
+            self.procesar_vuelo(id_vuelo, asignacion, plazo, writer if avisar_autorizacion else None)
+        )
+        desconexion = asyncio.create_task(self._esperar_desconexion(reader))
+
+        await asyncio.wait({operacion, desconexion}, return_when=asyncio.FIRST_COMPLETED)
 
-        print(f"[TORRE] {id_vuelo} comienza {vuelo['tipo']} en pista {vuelo['pista']}")
+        if operacion.done():
+            desconexion.cancel()
+            if operacion.result():
+                await self._responder(writer, {'status': 'completado', 'mensaje': 'Operación completada'})
+            else:
+                await self._responder(writer, {
+                    'status': 'cancelado',
+                    'mensaje': 'Plazo de espera agotado sin pista disponible'
+                })
+        else:
+            # El avión se ha ido: cancelamos su tarea para no gastar pista en un vuelo huérfano
+            print(f"[TORRE] {id_vuelo} se ha desconectado, se cancela su operación")
+            operacion.cancel()
+            try:
+                await operacion
+            except asyncio.CancelledError:
+                pass
+
+    async def _esperar_desconexion(self, reader):
+        """Termina cuando el avión cierra la conexión"""
+        try:
+            while await reader.read(1024):
+                pass
+        except ConnectionError:
+            pass
+
+    async def procesar_vuelo(self, id_vuelo, asignacion, plazo=None, writer=None):
+        """Ejecuta la operación de un vuelo. Devuelve False si venció el plazo sin pista asignada"""
+        vuelo = self.vuelos_pendientes.get(id_vuelo)
+        pista = None
+        hora_asignacion = None
+        try:
+            # Esperamos a que el planificador nos asigne pista, como mucho hasta el plazo del avión
+            restante = None
+            if plazo is not None and vuelo is not None:
+                restante = max(0, vuelo["hora_solicitud"] + plazo - time.perf_counter())
+            await asyncio.wait({asignacion}, timeout=restante)
+            if not asignacion.done():
+                self.planificador.cancelar(id_vuelo)
+                self.vuelos_pendientes.pop(id_vuelo, None)
+                self.plazos_vencidos += 1
+                print(f"[TORRE] {id_vuelo}: plazo de espera agotado, se retira la solicitud")
+                return False
+
+            pista, espera_separacion, servicio = asignacion.result()
+            hora_asignacion = time.perf_counter()
+
+            # Movemos el vuelo de pendiente a activo
+            vuelo = self.vuelos_pendientes.pop(id_vuelo, None)
+            if not vuelo:
+                print(f"[TORRE] Error: El vuelo {id_vuelo} ya no está pendiente")
+                self.planificador.liberar(pista, 0, completada=False)
+                return False
+                
+            vuelo["estado"] = "activo"
+            vuelo["pista"] = pista
+            self.vuelos_activos[id_vuelo] = vuelo
+
+            if writer is not None:
+                await self._responder(writer, self._autorizacion(vuelo["tipo"], asignacion.result()))
 
-        # Simulamos el tiempo de operación
-        tiempo_operacion = 2 + (1 if vuelo["tipo"] == "aterrizaje" else 0.5)
-        await asyncio.sleep(tiempo_operacion)
+            # Separación respecto a la operación anterior en la misma pista
+            await asyncio.sleep(espera_separacion)
+
+            vuelo["hora_inicio"] = time.perf_counter()
+            print(f"[TORRE] {id_vuelo} comienza {vuelo['tipo']} en pista {pista}")
+
+            # Simulamos el tiempo de operación
+            await asyncio.sleep(servicio)
+
+        except asyncio.CancelledError:
+            self._cancelar_vuelo(id_vuelo, asignacion, pista, hora_asignacion)
+            raise
 
         # Completamos la operación
         vuelo = self.vuelos_activos.pop(id_vuelo)
         hora_fin = time.perf_counter()
         vuelo["duracion"] = hora_fin - vuelo["hora_inicio"]
         vuelo["tiempo_espera"] = vuelo["hora_inicio"] - vuelo["hora_solicitud"]
+        vuelo["fin"] = time.time()
         self.vuelos_completados[id_vuelo] = vuelo
         self.operaciones_completadas += 1
+        # Número de secuencia: los suscriptores saben hasta dónde han recibido aunque falte algún lote
+        vuelo["secuencia"] = self.operaciones_completadas
         self.tiempo_espera_total += vuelo["tiempo_espera"]
-        self.pistas_ocupadas -= 1
+        # Para el modelo de colas la espera termina al asignar pista: la separación es servicio
+        self.esperas.append(hora_asignacion - vuelo["hora_solicitud"])
+        self.ocupaciones.append(hora_fin - hora_asignacion)
+        self.planificador.liberar(pista, hora_fin - hora_asignacion)
+
+        print(f"[TORRE] {id_vuelo} finalizó su {vuelo['tipo']} en pista {pista}")
+        return True
+
+    def _cancelar_vuelo(self, id_vuelo, asignacion, pista, hora_asignacion):
+        """Libera lo que ocupaba un vuelo cuyo avión se ha desconectado"""
+        self.vuelos_pendientes.pop(id_vuelo, None)
+        self.vuelos_activos.pop(id_vuelo, None)
 
-        print(f"[TORRE] {id_vuelo} finalizó su {vuelo['tipo']} en pista {vuelo['pista']}")
+        if pista is None and asignacion.done() and not asignacion.cancelled():
+            # La pista se asignó pero la tarea se canceló antes de llegar a usarla
+            pista, hora_asignacion = asignacion.result().pista, time.perf_counter()
 
-    def _asignar_pista(self):
-        return (self.operaciones_completadas % MAX_PISTAS) + 1
+        if pista is None:
+            self.planificador.cancelar(id_vuelo)
+            self.vuelos_cancelados += 1
+        else:
+            # La pista ya estaba reservada: el tiempo consumido es capacidad desperdiciada
+            desperdicio = time.perf_counter() - hora_asignacion
+            self.planificador.liberar(pista, desperdicio, completada=False)
+            self.operaciones_interrumpidas += 1
+            self.tiempo_pista_desperdiciado += desperdicio
+            print(f"[TORRE] Pista {pista} liberada tras interrumpir la operación de {id_vuelo}")
+
+    async def manejar_suscripcion(self, reader, writer):
+        try:
+            # El suscriptor indica los temas que le interesan: {"temas": [...]}
+            peticion = await leer_mensaje(reader)
+            temas = [tema for tema in peticion.get('temas', TEMAS) if tema in TEMAS]
+        except (asyncio.IncompleteReadError, json.JSONDecodeError, AttributeError) as e:
+            print(f"[TORRE] Suscripción inválida: {e}")
+            writer.close()
+            return
 
-    async def enviar_actualizaciones_monitor(self):
+        suscriptor = Suscriptor(writer, temas)
+        self.suscriptores.add(suscriptor)
+        # Los completados ya publicados no llegarán a este suscriptor: se lo indicamos en el acuse
+        suscriptor.encolar("suscripcion", empaquetar_mensaje("suscripcion", {
+            "temas": temas,
+            "completados_publicados": self.completados_publicados
+        }))
+        print(f"[TORRE] Nuevo suscriptor ({', '.join(temas)}). Total: {len(self.suscriptores)}")
+
+        try:
+            await suscriptor.enviar_pendientes()
+        except (ConnectionError, OSError, asyncio.CancelledError):
+            # CancelledError: la torre se está deteniendo
+            pass
+        finally:
+            self._descartar_suscriptor(suscriptor)
+
+    def _descartar_suscriptor(self, suscriptor, abortar=False):
+        if suscriptor in self.suscriptores:
+            self.suscriptores.discard(suscriptor)
+            print(f"[TORRE] Suscriptor desconectado. Total: {len(self.suscriptores)}")
+        suscriptor.cerrar(abortar)
+
+    def _publicar(self, tema, datos):
+        """Serializa el mensaje una sola vez y lo comparte entre los buffers de los suscriptores"""
+        interesados = [s for s in self.suscriptores if tema in s.temas]
+        if not interesados:
+            return False
+
+        mensaje = empaquetar_mensaje(tema, datos)
+        for suscriptor in interesados:
+            if not suscriptor.encolar(tema, mensaje):
+                print("[TORRE] Suscriptor demasiado lento, se descarta.")
+                self._descartar_suscriptor(suscriptor, abortar=True)
+        return True
+
+    async def publicar_actualizaciones(self):
         while True:
-            await asyncio.sleep(1)
+            await asyncio.sleep(self.intervalo_publicacion)
+            await self.publicacion_activa.wait()
+
+            if not self.suscriptores:
+                continue
 
             try:
-                with socket.create_connection((HOST, MONITOR_PORT), timeout=1) as s:
-                    # Creamos una copia del diccionario de vuelos completados
-                    vuelos_finalizados = dict(self.vuelos_completados)
-                    
-                    # Limpiamos el diccionario después de cada envío al monitor
-                    # para no enviar los mismos vuelos repetidamente
+                self._publicar("estado", {
+                    "pistas_disponibles": MAX_PISTAS - self._pistas_en_uso(),
+                    "pistas_totales": MAX_PISTAS,
+                    "vuelos_pendientes": self.vuelos_pendientes,
+                    "vuelos_activos": self.vuelos_activos,
+                    # Contador de la misma instantánea, para saber cuántos completados faltan por llegar
+                    "operaciones_completadas": self.operaciones_completadas
+                })
+
+                # Los vuelos completados se conservan hasta que algún suscriptor los recibe
+                # para no enviar los mismos vuelos repetidamente ni perderlos
+                if self.vuelos_completados and self._publicar("completados", self.vuelos_completados):
                     self.vuelos_completados = {}
+                    self.completados_publicados = self.operaciones_completadas
+
+                self._publicar("estadisticas", self._estadisticas())
 
-                    estado = {
-                        "timestamp": datetime.now().strftime("%H:%M:%S"),
-                        "pistas_disponibles": MAX_PISTAS - self._pistas_en_uso(),
-                        "pistas_totales": MAX_PISTAS,
-                        "vuelos_pendientes": self.vuelos_pendientes,
-                        "vuelos_activos": self.vuelos_activos,
-                        "vuelos_completados": vuelos_finalizados,
-                        "estadisticas": {
-                            "tiempo_espera_promedio": (
-                                self.tiempo_espera_total / self.operaciones_completadas
-                                if self.operaciones_completadas > 0 else 0
-                            ),
-                            "operaciones_completadas": self.operaciones_completadas
-                        }
-                    }
-
-                    mensaje = json.dumps(estado).encode()
-                    longitud = len(mensaje).to_bytes(4, byteorder='big')
-                    s.sendall(longitud + mensaje)
-
-            except (ConnectionRefusedError, socket.timeout):
-                print("[TORRE] No se pudo conectar con el monitor.")
             except Exception as e:
-                print(f"[TORRE] Error al enviar actualización: {e}")
+                print(f"[TORRE] Error al publicar actualización: {e}")
+
+    def _estadisticas(self):
+        return {
+            "tiempo_espera_promedio": (
+                self.tiempo_espera_total / self.operaciones_completadas
+                if self.operaciones_completadas > 0 else 0
+            ),
+            "operaciones_completadas": self.operaciones_completadas,
+            "vuelos_cancelados": self.vuelos_cancelados,
+            "plazos_vencidos": self.plazos_vencidos,
+            "operaciones_interrumpidas": self.operaciones_interrumpidas,
+            "tiempo_pista_desperdiciado": round(self.tiempo_pista_desperdiciado, 2),
+            **self.planificador.informe_capacidad(),
+            **self._medidas_cola()
+        }
+
+    def _medidas_cola(self):
+        """Tasa de llegadas, tiempo de ocupación de pista y percentiles de espera medidos"""
+        # Llegadas y utilización se miden en la misma ventana: desde la primera solicitud
+        transcurrido = (
+            time.perf_counter() - self.primera_solicitud
+            if self.primera_solicitud is not None else 0
+        )
+        esperas = sorted(self.esperas)
+        ocupado = sum(pista.tiempo_ocupada for pista in self.planificador.pistas.values())
+
+        servicio_medio = sum(self.ocupaciones) / len(self.ocupaciones) if self.ocupaciones else 0
+        servicio_cv2 = 0
+        if servicio_medio > 0:
+            varianza = sum((t - servicio_medio) ** 2 for t in self.ocupaciones) / len(self.ocupaciones)
+            servicio_cv2 = varianza / servicio_medio ** 2
+
+        return {
+            "llegadas_ops_hora": round(self.solicitudes_recibidas * 3600 / transcurrido, 1) if transcurrido > 0 else 0,
+            "servicio_medio": round(servicio_medio, 3),
+            "servicio_cv2": round(servicio_cv2, 3),
+            "utilizacion_media": round(ocupado / (MAX_PISTAS * transcurrido), 3) if transcurrido > 0 else 0,
+            "espera_media": round(sum(esperas) / len(esperas), 3) if esperas else 0,
+            "espera_p50": round(percentil(esperas, 50), 3),
+            "espera_p95": round(percentil(esperas, 95), 3),
+            "espera_p99": round(percentil(esperas, 99), 3)
+        }
+
+    def _cmd_pausar(self):
+        # Los vuelos completados se conservan y se publican al reanudar
+        self.publicacion_activa.clear()
+        return {"publicacion_pausada": True}
+
+    def _cmd_reanudar(self):
+        self.publicacion_activa.set()
+        return {"publicacion_pausada": False}
+
+    def _cmd_estadisticas(self):
+        return {
+            **self._estadisticas(),
+            "pistas_disponibles": MAX_PISTAS - self._pistas_en_uso(),
+            "pistas_totales": MAX_PISTAS,
+            "vuelos_pendientes": len(self.vuelos_pendientes),
+            "vuelos_activos": len(self.vuelos_activos),
+            "suscriptores": len(self.suscriptores),
+            "intervalo_publicacion": self.intervalo_publicacion,
+            "publicacion_pausada": not self.publicacion_activa.is_set()
+        }
+
+    def _cmd_intervalo(self, intervalo):
+        self.intervalo_publicacion = max(0.1, float(intervalo))
+        return {"intervalo_publicacion": self.intervalo_publicacion}
 
     def _pistas_en_uso(self):
-        return self.pistas_ocupadas
+        return self.planificador.pistas_ocupadas()
 
 if __name__ == "__main__":
     try: